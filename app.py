@@ -1,36 +1,16 @@
 
+import io
+import json
+import os
+from contextlib import nullcontext
+
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import PyPDF2
-import re
 
-# -----------------------------
-# Helper functions
-# -----------------------------
-def read_pdf(file):
-    reader = PyPDF2.PdfReader(file)
-    text = ""
-    for page in reader.pages:
-        page_text = page.extract_text()
-        if page_text:
-            text += page_text + " "
-    return text
-
-def clean_text(t):
-    if not t:
-        return ""
-    t = re.sub(r"\s+", " ", t)
-    t = t.replace("\u00A0", " ").strip()
-    return t
-
-def calculate_similarity(text1, text2):
-    vectorizer = TfidfVectorizer(stop_words="english")
-    tfidf = vectorizer.fit_transform([text1, text2])
-    score = cosine_similarity(tfidf[0:1], tfidf[1:2])[0][0]
-    return round(score * 100, 2)
+from talentfit import startup, timing
+from talentfit.cache import DEFAULT_CACHE_PATH, content_hash
+
+# pandas, plotly, scikit-learn and PyPDF2 are imported through startup.lazy_import only once a
+# CV arrives, so the uploader renders without paying for them
 
 # -----------------------------
 # Streamlit UI
@@ -39,150 +19,239 @@ st.set_page_config(page_title="TalentFit", layout="wide")
 st.title("TalentFit: Career Fit Analyzer")
 st.caption("Analyze your CV against a fixed Siemens Healthineers job description and highlight match levels by skill")
 
+# Longer uploads are almost always a mistake; only their first pages are scored
+PAGE_BUDGET = 60
+
 # -----------------------------
-# File uploader with unique key
+# Job scorer and background scoring queue, shared by all sessions
 # -----------------------------
-cv_file = st.file_uploader("Upload CV (PDF)", type=["pdf"], key="cv_upload_unique")
+@st.cache_resource
+def get_job_scorer():
+    scoring = startup.lazy_import("talentfit.vectors")
+    profile = startup.lazy_import("talentfit.profile")
+    return scoring.JobScorer(profile=profile.load_or_build())
+
+@st.cache_resource
+def get_scoring_queue():
+    background = startup.lazy_import("talentfit.background")
+    if os.environ.get("TALENTFIT_METRICS_PORT"):
+        # Prometheus scrape target for this server process; the queue records every scored CV
+        startup.lazy_import("talentfit.metrics").serve(int(os.environ["TALENTFIT_METRICS_PORT"]))
+    return background.ScoringQueue(
+        get_job_scorer().profile, cache_path=DEFAULT_CACHE_PATH, budget=(PAGE_BUDGET, None)
+    )
 
 # -----------------------------
-# Fixed Job Description (Python-friendly)
+# Per-CV memoization: reruns (expander, download, any widget) reuse the first result
 # -----------------------------
-job_desc = (
-    "Do you want to help create the future of healthcare? Our name, Siemens Healthineers, "
-    "was selected to honor our people who dedicate their energy and passion to this cause. "
-    "It reflects their pioneering spirit combined with our long history of engineering "
-    "in the ever-evolving healthcare industry.\n\n"
-
-    "We offer you a flexible and dynamic environment with opportunities to go beyond your comfort zone "
-    "in order to grow personally and professionally. Sounds interesting?\n\n"
-
-    "Then come and join our global team as Compliance & Digital Transformation Expert (f/m/d), "
-    "to drive digital transformation in compliance and help shape the future of risk management.\n\n"
-
-    "Choose the best place for your work – Within the scope of this position, it is possible, in consultation "
-    "with your manager, to work mobile (within Germany) up to an average volume of 60% of the respective working hours.\n\n"
-
-    "Even more flexibility? Mobile working from abroad is possible for up to 30 days a year under certain conditions "
-    "and in selected countries.\n\n"
-
-    "This position can be filled anywhere in the world where Siemens Healthineers is present.\n\n"
-
-    "Your tasks and responsibilities:\n"
-    "- You take ownership of developing and executing the compliance department's digitalization strategy.\n"
-    "- You lead and support key digitization projects, ensuring successful implementation in collaboration with global stakeholders.\n"
-    "- You identify compliance needs together with Governance Owners and Regional Compliance Officers and turn them into impactful change projects.\n"
-    "- You assess internal risk management processes, analyze compliance trends (e.g., technical compliance, ethics, sustainability), and develop measures to minimize risk.\n"
-    "- You contribute to M&A transactions from due diligence to integration and support continuous improvement of the Siemens Healthineers Compliance System.\n"
-    "- You foster knowledge exchange with compliance colleagues worldwide and drive innovation in compliance training.\n\n"
-
-    "Your qualifications and experience:\n"
-    "- You have a degree in Compliance, IT, Business Administration, or a related field.\n"
-    "- You have professional experience in compliance and/or IT and/or digitalization projects.\n"
-    "- You have experience in project management and working in international environments.\n"
-    "- Ideally, you have a strong understanding of risk management and compliance frameworks.\n\n"
-
-    "Your attributes and skills:\n"
-    "- You are proficient in English, enabling you to collaborate effectively with global teams and communicate confidently across regions and headquarters.\n"
-    "- You are confident in decision-making under uncertainty and thrive in dynamic environments.\n"
-    "- You have a strong aptitude for new technologies, digitalization, and automation, enabling you to lead initiatives that modernize compliance processes and systems.\n"
-    "- You demonstrate excellent analytical and critical thinking skills.\n"
-    "- You communicate effectively and build trust across diverse teams ensuring smooth collaboration with governance owners, regional compliance officers, and headquarters as well as IT stakeholders.\n"
-    "- You work independently with an entrepreneurial mindset, taking ownership of projects and managing multiple priorities in a global setting.\n"
-    "- You are a team player with strong leadership and interpersonal skills."
-)
+def upload_hash(uploaded):
+    # Hash each upload once per session instead of on every rerun
+    hashes = st.session_state.setdefault("upload_hashes", {})
+    if uploaded.file_id not in hashes:
+        with timing.recording() as timings, timing.stage("upload_read") as span:
+            data = uploaded.getvalue()
+            span.bytes = len(data)
+        hashes[uploaded.file_id] = content_hash(data)
+        st.session_state.setdefault("upload_timings", {})[uploaded.file_id] = timings.as_dict()
+    return hashes[uploaded.file_id]
+
+def result_key(uploaded, trace=False):
+    # Same CV, job description, taxonomy and page budget -> same result, across sessions
+    profile = get_job_scorer().profile
+    return (upload_hash(uploaded), profile.job_desc_hash, profile.taxonomy_hash, PAGE_BUDGET, trace)
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def build_report(results, trace=False):
+    # pandas and plotly.express load with talentfit.report, on the first result
+    return startup.lazy_import("talentfit.report").build_report(results, trace)
 
 # -----------------------------
-# Skill keywords
+# File uploader with unique key
 # -----------------------------
-skills = {
-    "Compliance & Risk Management": [
-        "compliance", "risk", "ethics", "technical compliance", "sustainability", "framework", "governance"
-    ],
-    "Digitalization": [
-        "digital", "digitalization", "automation", "system", "tool", "IT", "technology", "modernize", "innovation"
-    ],
-    "M&A & Due Diligence": [
-        "merger", "acquisition", "due diligence", "integration", "transaction"
-    ],
-    "Global Experience": [
-        "global", "regional", "international", "cross-border", "headquarters", "collaboration"
-    ],
-    "Project Management": [
-        "project", "program", "coordination", "initiative", "implementation", "ownership", "priorities", "dynamic environment"
-    ],
-    "Training": [
-        "training", "workshop", "education", "knowledge exchange", "learning", "development"
-    ],
-    "Regulatory Knowledge": [
-        "regulation", "FCPA", "sanctions", "compliance", "laws", "medtech", "framework"
-    ]
-}
+cv_files = st.file_uploader("Upload CVs (PDF)", type=["pdf"], accept_multiple_files=True, key="cv_upload_unique")
+startup.mark("first_render")
+trace_runs = st.sidebar.toggle("Record pipeline traces", help="Re-scores the CVs and offers a Chrome trace of each run")
+profile_run = st.sidebar.toggle("Profile this run", help="Runs the selected CV from PDF to chart under cProfile")
 
 # -----------------------------
-# Process CV and calculate skill match
+# Queue uploads for background scoring
 # -----------------------------
-if cv_file:
-    raw_cv_text = read_pdf(cv_file)
-    cv_text = clean_text(raw_cv_text)
-    job_desc_clean = clean_text(job_desc)
-
-    results = []
-    for skill, keywords in skills.items():
-        cv_part = " ".join([k for k in keywords if k.lower() in cv_text.lower()])
-        jd_part = " ".join([k for k in keywords if k.lower() in job_desc_clean.lower()])
-        score = calculate_similarity(cv_part, jd_part) if cv_part and jd_part else 40
-        results.append([skill, score])
-
-    df = pd.DataFrame(results, columns=["Skill", "Match %"])
-    overall_score = round(df["Match %"].mean(), 2)
-
-    # -----------------------------
-    # Display Results - Two Column Layout (Metrics)
-    # -----------------------------
-    st.divider()
-    col1, col2 = st.columns(2)
-    with col1:
-        st.metric("Overall Match", f"{overall_score}%")
-    with col2:
-        strong_count = len(df[df["Match %"] >= 70])
-        st.metric("Strong Matches (≥70%)", f"{strong_count}/{len(df)}")
-
-    # -----------------------------
-    # Skills Ranked by Match (Bar Chart)
-    # -----------------------------
-    st.subheader("📊 Skills Ranked by Match")
-    df_sorted = df.sort_values("Match %", ascending=False)
-
-    fig = px.bar(
-        df_sorted,
-        x="Skill",
-        y="Match %",
-        title="Skill Match Overview",
-        range_y=[0, 100],
-        color=df_sorted["Match %"].apply(lambda x: "Strong" if x >= 70 else "Needs Work"),
-        color_discrete_map={"Strong": "#00CC66", "Needs Work": "#FF9933"}
-    )
-    st.plotly_chart(fig, use_container_width=True)
-
-    # -----------------------------
-    # Show Table (Ranked) - English title + index starts from 1
-    # -----------------------------
-    with st.expander("Show Table (Ranked)"):
-        df_show = df_sorted.reset_index(drop=True)
-        df_show.index = df_show.index + 1  # Start index from 1 instead of 0
-        st.dataframe(df_show, use_container_width=True)
-
-    # -----------------------------
-    # CSV Download
-    # -----------------------------
-    st.divider()
-    csv = df_sorted.to_csv(index=False)
-    st.download_button(
-        "📥 Download Results (CSV)",
-        csv,
-        "cv_analysis.csv",
-        "text/csv"
-    )
+def submit_uploads(files):
+    # Idempotent: CVs already queued or scored are skipped, so every poll retries the ones a full
+    # queue turned away. Returns the (file_id, name, key) entries and how many are still waiting.
+    queue = get_scoring_queue()
+    background = startup.lazy_import("talentfit.background")
+    entries, deferred = [], 0
+    for f in files:
+        key = result_key(f, trace_runs)
+        try:
+            queue.submit(key, f.name, f.getvalue(), trace=trace_runs)
+        except background.QueueFull:
+            deferred += 1
+        entries.append((f.file_id, f.name, key))
+    return entries, deferred
+
+def profile_analysis(uploaded):
+    # The whole path for one CV in this process, chart render included; returns what the UI shows
+    profiling = startup.lazy_import("talentfit.profiling")
+    report = startup.lazy_import("talentfit.report")
+    scoring = startup.lazy_import("talentfit.scoring")
+    with profiling.profiling() as run:
+        text = scoring.read_pdf_limited(io.BytesIO(uploaded.getvalue()), PAGE_BUDGET)
+        fig = report.build_report(get_job_scorer().score(text))[2]
+        st.plotly_chart(fig, use_container_width=True)
+    return {"top": run.top(), "text": run.text(), "prof": run.dump()}
+
+def candidate_rows(entries):
+    queue = get_scoring_queue()
+    rows = []
+    for file_id, name, key in entries:
+        state, row = queue.status(key)
+        rows.append({**(row or {}), "File": name, "Status": state or "waiting", "file_id": file_id})
+    return rows
+
+def candidate_table(rows):
+    pd = startup.lazy_import("pandas")
+    skill_names = list(get_job_scorer().skill_names)
+    df = pd.DataFrame(rows, columns=["File", "Status", "Overall Match %", *skill_names, "Error"])
+    df = df.sort_values(["Overall Match %", "File"], ascending=[False, True], na_position="last")
+    df = df.reset_index(drop=True)
+    df.index = df.index + 1  # Start index from 1 instead of 0
+    return df
+
+def progress_panel(files):
+    entries, deferred = submit_uploads(files)
+    rows = candidate_rows(entries)
+    finished = sum(r["Status"] in ("done", "failed") for r in rows)
+    st.progress(finished / len(rows), text=f"Scored {finished}/{len(rows)} CVs")
+    if deferred:
+        st.caption(f"Scoring queue is full; {deferred} CVs wait here and are submitted as earlier ones finish.")
+    st.dataframe(candidate_table(rows), use_container_width=True)
+    if finished == len(rows) and st.session_state.get("scored_batch") != entries:
+        # Everything is in: one full rerun renders the per-candidate detail below
+        st.session_state["scored_batch"] = entries
+        st.rerun()
+
+# -----------------------------
+# Process CVs and calculate skill match
+# -----------------------------
+if cv_files:
+    entries, _ = submit_uploads(cv_files)
+    all_finished = all(r["Status"] in ("done", "failed") for r in candidate_rows(entries))
+
+    st.subheader("🏆 Ranked Candidates")
+    # Poll once a second while CVs are scoring, without blocking the rest of the page
+    st.fragment(progress_panel, run_every=None if all_finished else 1.0)(cv_files)
+
+    # Keyed by upload, not by name: a batch can hold several "CV.pdf"
+    done = {r["file_id"]: r for r in candidate_rows(entries) if r["Status"] == "done"}
+    # No st.stop() when nothing is scored yet: the sidebar below renders on every run
+    if done:
+        ranked = sorted(done, key=lambda file_id: -done[file_id]["Overall Match %"])
+        names = [done[file_id]["File"] for file_id in ranked]
+        labels = {file_id: name if names.count(name) == 1 else f"{name} ({done[file_id]['Overall Match %']}%, #{i})"
+                  for i, (file_id, name) in enumerate(zip(ranked, names), 1)}
+        selected = ranked[0] if len(ranked) == 1 else st.selectbox("Candidate", ranked, format_func=labels.get)
+        selected_name = done[selected]["File"]
+        results = [[skill, done[selected][skill]] for skill in get_job_scorer().skill_names]
+        df, df_sorted, fig, csv, report_timings, report_trace = build_report(results, trace_runs)
+
+        # Where this candidate's time went: upload here, extraction and scoring in the worker, report here
+        uploaded = next(f for f in cv_files if f.file_id == selected)
+        stage_timings = timing.StageTimings(st.session_state.get("upload_timings", {}).get(uploaded.file_id, {}))
+        # The worker's upload_read only wraps the bytes read here; count the read once
+        worker_timings = {k: v for k, v in done[selected].get("Timings", {}).items() if k != "upload_read"}
+        stage_timings.merge(worker_timings).merge(report_timings)
+        overall_score = round(df["Match %"].mean(), 2)
+
+        # -----------------------------
+        # Display Results - Two Column Layout (Metrics)
+        # -----------------------------
+        st.divider()
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric("Overall Match", f"{overall_score}%")
+        with col2:
+            strong_count = len(df[df["Match %"] >= 70])
+            st.metric("Strong Matches (≥70%)", f"{strong_count}/{len(df)}")
+
+        # -----------------------------
+        # Skills Ranked by Match (Bar Chart)
+        # -----------------------------
+        st.subheader("📊 Skills Ranked by Match")
+        app_tracer = timing.Tracer("streamlit").extend(report_trace) if trace_runs else None
+        profiles = st.session_state.setdefault("run_profiles", {})
+        profile_key = result_key(uploaded)
+        if profile_run and profile_key not in profiles:
+            profiles[profile_key] = profile_analysis(uploaded)  # renders the chart itself
+        else:
+            with timing.recording(stage_timings), timing.tracing(app_tracer) if trace_runs else nullcontext():
+                with timing.stage("plotly_render"):
+                    st.plotly_chart(fig, use_container_width=True)
+        st.session_state["stage_timings"] = {"file": selected_name, "stages": stage_timings.as_dict()}
+
+        # -----------------------------
+        # Show Table (Ranked) - English title + index starts from 1
+        # -----------------------------
+        with st.expander("Show Table (Ranked)"):
+            df_show = df_sorted.reset_index(drop=True)
+            df_show.index = df_show.index + 1  # Start index from 1 instead of 0
+            st.dataframe(df_show, use_container_width=True)
+
+        # -----------------------------
+        # CSV Download
+        # -----------------------------
+        st.divider()
+        st.download_button(
+            "📥 Download Results (CSV)",
+            csv,
+            "cv_analysis.csv",
+            "text/csv"
+        )
+        if trace_runs and done[selected].get("Trace"):
+            app_tracer.extend(done[selected]["Trace"])
+            st.download_button(
+                "📥 Download Trace (Chrome JSON)",
+                json.dumps(app_tracer.to_json()),
+                f"{selected_name.rsplit('.', 1)[0]}.trace.json",
+                "application/json"
+            )
+        if profile_run and profile_key in profiles:
+            run_profile = profiles[profile_key]
+            stem = selected_name.rsplit(".", 1)[0]
+            with st.expander("🔬 Profile of this run (top functions by cumulative time)", expanded=True):
+                st.dataframe(
+                    [{"Function": r["function"], "Location": f"{os.path.basename(r['file'])}:{r['line']}",
+                      "Calls": r["calls"], "Cumulative s": r["cumulative_s"], "Own s": r["total_s"]}
+                     for r in run_profile["top"]],
+                    use_container_width=True,
+                )
+            st.download_button("📥 Download Profile (.prof)", run_profile["prof"], f"{stem}.prof",
+                               "application/octet-stream")
+            st.download_button("📥 Download Top Functions (.txt)", run_profile["text"], f"{stem}.profile.txt",
+                               "text/plain")
+
+        startup.mark("first_result")
 
 else:
-    st.info("👆 Upload your CV (PDF format) to begin")
+    st.info("👆 Upload one or more CVs (PDF format) to begin")
+
+# -----------------------------
+# Cold-start report (first run of this server process)
+# -----------------------------
+with st.sidebar.expander("⏱ Startup report"):
+    startup_report = startup.report()
+    if startup_report["over_budget"]:
+        st.warning(f"First render exceeded the {startup_report['budget_ms']:.0f} ms cold-start budget")
+    if startup_report["heavy_at_first_render"]:
+        st.warning("Loaded before first render: " + ", ".join(startup_report["heavy_at_first_render"]))
+    st.markdown(startup.report_markdown())
+
+if st.sidebar.toggle("Show performance panel"):
+    with st.sidebar.expander("⚙ Performance", expanded=True):
+        last = st.session_state.get("stage_timings")
+        if last:
+            st.caption(f"Pipeline stages for {last['file']}")
+            st.markdown(timing.StageTimings(last["stages"]).to_markdown())
+        else:
+            st.caption("Stage timings appear once a CV has been scored")
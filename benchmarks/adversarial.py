@@ -0,0 +1,130 @@
+"""Generator of pathological PDFs that are slow or memory-hungry to extract.
+
+    python -m benchmarks.adversarial -o /tmp/adversarial [--scale 2]
+
+Every case is a valid PDF a hostile or broken producer could upload. ``scale`` multiplies
+the size of the pathology (nesting depth excepted, which grows by ``scale`` levels):
+
+* ``nested_forms``  form XObjects that each draw their child twice, ``2**depth`` text draws
+* ``deep_arrays``   one content-stream operand nested thousands of arrays deep
+* ``inline_image``  a large uncompressed inline image (BI ... ID ... EI) on a text page
+* ``tiny_runs``     every character positioned and drawn on its own (Td + Tj per glyph)
+* ``flate_bomb``    a small Flate stream that inflates to hundreds of MB of text operators
+* ``baseline``      an ordinary 2-page CV for reference
+"""
+import argparse
+import random
+import sys
+import zlib
+from pathlib import Path
+
+from .corpus import sample_text as _text
+from .pdfwriter import PAGE_HEIGHT, PAGE_WIDTH, make_text_pdf, serialize
+
+_FONT = b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"
+
+
+def _stream(data, extra=b""):
+    return b"<< /Length %d %s>>\nstream\n" % (len(data), extra) + data + b"\nendstream"
+
+def _single_page(content, xobjects=b"", extra_objects=()):
+    """Catalog, pages, one page (object 3) drawing ``content`` (object 4), font (object 5), then extras."""
+    return serialize([
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] /Contents 4 0 R "
+        b"/Resources << /Font << /F1 5 0 R >> %s>> >>" % (PAGE_WIDTH, PAGE_HEIGHT, xobjects),
+        content if content.startswith(b"<<") else _stream(content),
+        _FONT,
+        *extra_objects,
+    ])
+
+
+# -----------------------------
+# Cases
+# -----------------------------
+def baseline(scale=1):
+    return make_text_pdf([_text(450, seed=i) for i in range(2)])
+
+def nested_forms(scale=1):
+    """Form ``i`` draws a line of text and then form ``i + 1`` twice."""
+    depth = 14 + scale
+    first = 6
+    forms = []
+    for level in range(depth):
+        child = b"/X%d Do /X%d Do" % (level + 1, level + 1) if level + 1 < depth else b""
+        resources = (b"/XObject << /X%d %d 0 R >>" % (level + 1, first + level + 1)) if child else b""
+        body = b"BT /F1 10 Tf 40 800 Td (level %d compliance) Tj ET " % level + child
+        forms.append(_stream(body, b"/Type /XObject /Subtype /Form /BBox [0 0 %d %d] "
+                                   b"/Resources << /Font << /F1 5 0 R >> %s>> " % (PAGE_WIDTH, PAGE_HEIGHT, resources)))
+    return _single_page(b"/X0 Do", b"/XObject << /X0 %d 0 R >> " % first, forms)
+
+def deep_arrays(scale=1):
+    depth = 5000 * scale
+    return _single_page(b"BT /F1 10 Tf 40 800 Td " + b"[" * depth + b"(deep)" + b"]" * depth + b" TJ ET")
+
+def inline_image(scale=1):
+    side = 2000 * scale
+    size = side * side * 3
+    # random pixels without the byte "E", so no premature "EI" inside the image data
+    block = bytes(random.Random(0).getrandbits(8) for _ in range(4096)).replace(b"E", b"F")
+    pixels = (block * (size // len(block) + 1))[:size]
+    content = (b"BT /F1 10 Tf 40 800 Td (" + _text(60).encode() + b") Tj ET\n"
+               b"q 500 0 0 500 40 40 cm BI /W %d /H %d /BPC 8 /CS /RGB ID " % (side, side)
+               + pixels + b" EI Q")
+    return _single_page(content)
+
+def tiny_runs(scale=1):
+    text = _text(4000 * scale)
+    ops = [b"BT /F1 6 Tf 20 820 Td"]
+    for i, ch in enumerate(text.encode("latin-1")):
+        ops.append(b"%s 0 Td (%s) Tj" % (b"-500" if i and i % 100 == 0 else b"5", bytes([ch]).replace(b"(", b"\\(")))
+    ops.append(b"ET")
+    return _single_page(b"\n".join(ops))
+
+def flate_bomb(scale=1):
+    """About 300:1; ``scale`` = 1 inflates to ~200 MB of ``(...) Tj`` operators."""
+    run = b"(" + b"x" * 90 + b") Tj\n"
+    inflated_mb = 200 * scale
+    compressor = zlib.compressobj(9)
+    chunk = run * (1024 * 1024 // len(run))
+    parts = [compressor.compress(b"BT /F1 10 Tf 40 800 Td\n")]
+    parts.extend(compressor.compress(chunk) for _ in range(inflated_mb))
+    parts.append(compressor.compress(b"ET") + compressor.flush())
+    data = b"".join(parts)
+    return _single_page(_stream(data, b"/Filter /FlateDecode "))
+
+
+CASES = {
+    "baseline": baseline,
+    "nested_forms": nested_forms,
+    "deep_arrays": deep_arrays,
+    "inline_image": inline_image,
+    "tiny_runs": tiny_runs,
+    "flate_bomb": flate_bomb,
+}
+
+
+def write_corpus(out_dir, cases=CASES, scale=1):
+    """Write ``<case>.pdf`` for each case; returns ``{case: path}``."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    paths = {}
+    for name in cases:
+        paths[name] = out_dir / f"{name}.pdf"
+        paths[name].write_bytes(CASES[name](scale))
+    return paths
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-o", "--out", required=True)
+    parser.add_argument("--cases", nargs="+", choices=list(CASES), default=list(CASES))
+    parser.add_argument("--scale", type=int, default=1)
+    args = parser.parse_args(argv)
+    for name, path in write_corpus(args.out, args.cases, args.scale).items():
+        print(f"{path.stat().st_size / 1e6:>9.2f} MB  {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
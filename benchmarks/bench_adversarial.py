@@ -0,0 +1,126 @@
+"""Time and peak RSS of read_pdf on pathological PDFs, one fresh process per document.
+
+    python -m benchmarks.bench_adversarial [--scale 1] [--timeout 30] [--json out.json]
+    python -m benchmarks.bench_adversarial --corpus /tmp/corpus/000 --timeout 10
+
+By default the adversarial corpus (``benchmarks.adversarial``) is generated in a temporary
+directory; ``--corpus`` benchmarks every PDF of an existing directory instead. Each document is
+extracted in its own spawned process so its peak RSS is its own and a document that runs past
+``--timeout`` is killed (its peak RSS is read from /proc before the kill) and reported as such.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from .adversarial import CASES, write_corpus
+
+
+def _vm_hwm_mb(pid):
+    """Peak RSS of a live process (Linux); None elsewhere."""
+    try:
+        with open(f"/proc/{pid}/status") as fh:
+            for line in fh:
+                if line.startswith("VmHWM:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return None
+
+def _maxrss_mb():
+    # ru_maxrss survives fork+exec on Linux (it would report the parent's peak); VmHWM does not
+    peak = _vm_hwm_mb(os.getpid())
+    return peak if peak is not None else round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+def _extract(path, conn):
+    import PyPDF2  # noqa: F401  (loaded before the baseline RSS is taken)
+
+    from talentfit.scoring import read_pdf
+
+    conn.send(_maxrss_mb())
+    start = time.perf_counter()
+    try:
+        text = read_pdf(path)
+        status, chars, error = "ok", len(text), ""
+    except Exception as exc:
+        status, chars, error = "error", 0, f"{type(exc).__name__}: {exc}"[:200]
+    conn.send({"status": status, "seconds": round(time.perf_counter() - start, 3),
+               "peak_rss_mb": _maxrss_mb(), "chars": chars, "error": error})
+
+def measure(path, timeout):
+    """Extract ``path`` in a new process; returns a result row."""
+    ctx = multiprocessing.get_context("spawn")
+    receiver, sender = ctx.Pipe(duplex=False)
+    proc = ctx.Process(target=_extract, args=(str(path), sender), daemon=True)
+    proc.start()
+    sender.close()
+    row = {"document": Path(path).name, "bytes": Path(path).stat().st_size}
+    try:
+        row["base_rss_mb"] = receiver.recv()  # imports done; the clock starts now
+        if receiver.poll(timeout):
+            row.update(receiver.recv())
+        else:
+            row.update(status="timeout", seconds=float(timeout), peak_rss_mb=_vm_hwm_mb(proc.pid), chars=None,
+                       error=f"no result after {timeout} s")
+    except EOFError:  # the process died: out of memory, segfault, ...
+        row.update(status="crashed", seconds=None, peak_rss_mb=None, chars=None,
+                   error=f"exit code {proc.exitcode}")
+    finally:
+        if proc.is_alive():
+            proc.kill()
+        proc.join()
+    return row
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q / 100 * len(values)))] if values else None
+
+def summarize(rows):
+    seconds = [r["seconds"] for r in rows if r["seconds"] is not None]
+    rss = [r["peak_rss_mb"] for r in rows if r["peak_rss_mb"] is not None]
+    return {
+        "documents": len(rows),
+        "timeouts": sum(r["status"] == "timeout" for r in rows),
+        "errors": sum(r["status"] in ("error", "crashed") for r in rows),
+        "p50_s": percentile(seconds, 50),
+        "p99_s": percentile(seconds, 99),
+        "max_s": max(seconds, default=None),
+        "max_peak_rss_mb": max(rss, default=None),
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", help="directory of PDFs to benchmark instead of the generated cases")
+    parser.add_argument("--cases", nargs="+", choices=list(CASES), default=list(CASES))
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--timeout", type=float, default=30.0, help="seconds before a document is killed")
+    parser.add_argument("--json", help="also write the rows and summary to this file")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.corpus:
+            paths = sorted(Path(args.corpus).glob("*.pdf"))
+        else:
+            paths = list(write_corpus(tmp, args.cases, args.scale).values())
+        rows = []
+        print(f"{'document':>24} {'MB':>8} {'status':>8} {'seconds':>8} {'peak RSS MB':>12} {'chars':>10}")
+        for path in paths:
+            r = measure(path, args.timeout)
+            rows.append(r)
+            print(f"{r['document']:>24} {r['bytes'] / 1e6:>8.2f} {r['status']:>8} {r['seconds'] or 0:>8.2f} "
+                  f"{r['peak_rss_mb'] or 0:>12.1f} {r['chars'] if r['chars'] is not None else '-':>10}")
+    summary = summarize(rows)
+    print(json.dumps(summary))
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump({"timeout_s": args.timeout, "rows": rows, "summary": summary}, fh, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""Throughput of each installed PDF backend and its keyword-hit agreement with PyPDF2.
+
+    python -m benchmarks.bench_backends [-n 60] [--pages 1 60] [--json out.json]
+    python -m benchmarks.bench_backends --corpus /tmp/corpus/000 --limit 200
+
+By default a synthetic corpus (``benchmarks.corpus``) is generated in a temporary directory;
+``--corpus`` benchmarks every PDF under an existing directory instead. Every installed backend,
+plus "auto" routing, extracts every document in this process. PyPDF2's output is the reference
+(it is what the app scores today). A document agrees when its set of matched keywords is
+identical; ``max_score_diff`` is the largest change of any skill score across the corpus.
+"""
+import argparse
+import io
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from talentfit import timing
+from talentfit.backends import AUTO, DEFAULT_BACKEND, available_backends, get_backend
+from talentfit.profile import load_or_build
+from talentfit.scoring import clean_text, read_pdf
+from talentfit.vectors import JobScorer
+
+from .corpus import write_corpus
+
+
+def extract_all(datas, backend):
+    """``(texts, seconds, pages, errors)``; a document that fails extracts as ""."""
+    texts, errors = [], 0
+    try:
+        read_pdf(io.BytesIO(datas[0]), backend)  # imports and first-use setup are not timed
+    except Exception:
+        pass
+    with timing.recording() as timings:
+        start = time.perf_counter()
+        for data in datas:
+            try:
+                texts.append(read_pdf(io.BytesIO(data), backend))
+            except Exception:
+                texts.append("")
+                errors += 1
+        seconds = time.perf_counter() - start
+    pages = timings.as_dict().get("read_pdf_page", {}).get("calls", 0)
+    return texts, seconds, pages, errors
+
+def agreement(scorer, texts, reference_hits, reference_scores):
+    hits = [scorer.matcher.hit_ids(clean_text(t)) for t in texts]
+    scores = scorer.score_hit_sets(hits)
+    same = sum(h == r for h, r in zip(hits, reference_hits))
+    jaccard = [len(h & r) / len(h | r) if h | r else 1.0 for h, r in zip(hits, reference_hits)]
+    diff = max((abs(a[1] - b[1]) for row, ref in zip(scores, reference_scores) for a, b in zip(row, ref)), default=0.0)
+    return {
+        "hit_agreement": round(same / len(texts), 4) if texts else None,
+        "mean_jaccard": round(sum(jaccard) / len(jaccard), 4) if jaccard else None,
+        "max_score_diff": round(diff, 2),
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", help="directory of PDFs (searched recursively) instead of a generated corpus")
+    parser.add_argument("--limit", type=int, default=None, help="benchmark only the first N PDFs")
+    parser.add_argument("-n", "--count", type=int, default=60, help="documents to generate")
+    parser.add_argument("--pages", type=int, nargs=2, default=[1, 60], metavar=("MIN", "MAX"))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--backends", nargs="+", default=None, help="default: every installed backend and auto")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.corpus:
+            root = Path(args.corpus)
+        else:
+            root = Path(tmp)
+            write_corpus(root, args.count, seed=args.seed, pages=tuple(args.pages))
+        paths = sorted(root.rglob("*.pdf"))[:args.limit]
+        datas = [p.read_bytes() for p in paths]
+    if not datas:
+        print("No PDF files found.", file=sys.stderr)
+        return 1
+    megabytes = sum(map(len, datas)) / 1e6
+
+    scorer = JobScorer(profile=load_or_build())
+    backends = list(args.backends or [*available_backends(), AUTO])
+    if DEFAULT_BACKEND in backends:  # reference first
+        backends.insert(0, backends.pop(backends.index(DEFAULT_BACKEND)))
+    reference = extract_all(datas, DEFAULT_BACKEND)
+    reference_hits = [scorer.matcher.hit_ids(clean_text(t)) for t in reference[0]]
+    reference_scores = scorer.score_hit_sets(reference_hits)
+
+    print(f"{len(datas)} documents, {megabytes:.1f} MB; reference: {get_backend(DEFAULT_BACKEND).module}")
+    print(f"{'backend':>10} {'seconds':>8} {'docs/s':>8} {'pages/s':>8} {'errors':>7} {'hits agree':>11} "
+          f"{'jaccard':>8} {'max diff':>9}")
+    results = []
+    for backend in backends:
+        texts, seconds, pages, errors = reference if backend == DEFAULT_BACKEND else extract_all(datas, backend)
+        row = {"backend": backend, "seconds": round(seconds, 3), "docs_per_sec": round(len(datas) / seconds, 1),
+               "pages_per_sec": round(pages / seconds, 1), "errors": errors,
+               **agreement(scorer, texts, reference_hits, reference_scores)}
+        results.append(row)
+        print(f"{backend:>10} {row['seconds']:>8.2f} {row['docs_per_sec']:>8.1f} {row['pages_per_sec']:>8.1f} "
+              f"{errors:>7} {row['hit_agreement']:>11.1%} {row['mean_jaccard']:>8.3f} {row['max_score_diff']:>9.2f}")
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump({"documents": len(datas), "megabytes": round(megabytes, 2), "results": results}, fh, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
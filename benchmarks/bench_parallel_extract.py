@@ -0,0 +1,66 @@
+"""Speed-up of read_pdf_parallel over read_pdf as the page count grows.
+
+    python -m benchmarks.bench_parallel_extract --pages 1 5 10 20 40 80 --workers 4
+"""
+import argparse
+import io
+import json
+import os
+import time
+
+from talentfit.extract import get_pool, read_pdf_parallel, shutdown_pool
+from talentfit.scoring import read_pdf
+
+from .corpus import sample_pdf
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+def run(page_counts, workers, repeat):
+    pool = get_pool(workers)
+    # warm the workers so process start-up is not billed to the first document
+    list(pool.map(abs, range(workers)))
+    rows = []
+    for n_pages in page_counts:
+        data = sample_pdf(n_pages)
+        seq, seq_text = best_of(lambda: read_pdf(io.BytesIO(data)), repeat)
+        par, par_text = best_of(lambda: read_pdf_parallel(data, workers=workers, min_pages=1), repeat)
+        assert seq_text == par_text, "parallel extraction changed the text"
+        rows.append({
+            "pages": n_pages,
+            "sequential_s": round(seq, 4),
+            "parallel_s": round(par, 4),
+            "speedup": round(seq / par, 2) if par else None,
+        })
+    return rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 5, 10, 20, 40, 80])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", help="also write the rows to this file")
+    args = parser.parse_args(argv)
+
+    try:
+        rows = run(args.pages, args.workers, args.repeat)
+    finally:
+        shutdown_pool()
+
+    print(f"workers={args.workers}")
+    print(f"{'pages':>6} {'sequential s':>13} {'parallel s':>11} {'speed-up':>9}")
+    for r in rows:
+        print(f"{r['pages']:>6} {r['sequential_s']:>13} {r['parallel_s']:>11} {r['speedup']:>8}x")
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump({"workers": args.workers, "rows": rows}, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Throughput and latency of the scoring service under synthetic concurrent load.
+
+    python -m benchmarks.bench_service --requests 2000 --concurrency 32 [--url http://127.0.0.1:8000]
+    python -m benchmarks.bench_service --compare-batching [--server-args "--batch-size 64 --batch-wait-ms 5"]
+
+Without ``--url`` a service is started on a free localhost port for the duration of the run.
+``--compare-batching`` runs the same load twice, once with request coalescing disabled
+(``--batch-size 1``) and once with the server's batching settings, and reports both.
+"""
+import argparse
+import http.client
+import json
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import urlparse
+
+from .corpus import sample_text
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def wait_ready(host, port, timeout=120):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection(host, port, timeout=2)
+            conn.request("GET", "/health")
+            if json.loads(conn.getresponse().read()).get("status") == "ok":
+                return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("service did not become ready")
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q / 100 * len(values)))]
+
+def run_load(host, port, bodies, concurrency):
+    latencies, errors, lock = [], [0], threading.Lock()
+    it = iter(bodies)
+
+    def client():
+        conn = http.client.HTTPConnection(host, port, timeout=60)
+        while True:
+            with lock:
+                body = next(it, None)
+            if body is None:
+                return
+            start = time.perf_counter()
+            conn.request("POST", "/score/text", body, {"Content-Type": "application/json"})
+            response = conn.getresponse()
+            response.read()
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+                if response.status != 200:
+                    errors[0] += 1
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - start
+    return {
+        "requests": len(latencies),
+        "errors": errors[0],
+        "concurrency": concurrency,
+        "throughput_rps": round(len(latencies) / wall, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "mean_ms": round(statistics.mean(latencies) * 1000, 2),
+    }
+
+def get_health(host, port):
+    conn = http.client.HTTPConnection(host, port, timeout=10)
+    conn.request("GET", "/health")
+    return json.loads(conn.getresponse().read())
+
+def bench_server(server_args, bodies, concurrency):
+    """Start a local service with ``server_args``, load it, and return the stats."""
+    host, port = "127.0.0.1", free_port()
+    server = subprocess.Popen([sys.executable, "-m", "talentfit.service", "--port", str(port),
+                               "--no-cache", *server_args])
+    try:
+        wait_ready(host, port)
+        stats = run_load(host, port, bodies, concurrency)
+        batching = get_health(host, port).get("batching")
+        if batching:
+            stats["mean_batch_size"] = batching["mean_batch_size"]
+        return stats
+    finally:
+        server.terminate()
+        server.wait()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="existing service; default starts one locally")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--server-args", default="", help="extra arguments for python -m talentfit.service")
+    parser.add_argument("--compare-batching", action="store_true",
+                        help="run unbatched (--batch-size 1) and batched servers on the same load")
+    args = parser.parse_args(argv)
+
+    bodies = [json.dumps({"text": sample_text(400, seed=i), "id": str(i)}) for i in range(args.requests)]
+    if args.url:
+        parsed = urlparse(args.url)
+        host, port = parsed.hostname, parsed.port or 80
+        wait_ready(host, port)
+        print(json.dumps(run_load(host, port, bodies, args.concurrency), indent=2))
+    elif args.compare_batching:
+        results = {
+            "unbatched": bench_server([*args.server_args.split(), "--batch-size", "1"], bodies, args.concurrency),
+            "batched": bench_server(args.server_args.split(), bodies, args.concurrency),
+        }
+        print(json.dumps(results, indent=2))
+    else:
+        print(json.dumps(bench_server(args.server_args.split(), bodies, args.concurrency), indent=2))
+
+
+if __name__ == "__main__":
+    main()
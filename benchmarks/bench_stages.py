@@ -0,0 +1,227 @@
+"""Per-stage timings of the scoring pipeline over small, medium and huge CVs.
+
+    python -m benchmarks.bench_stages --save benchmarks/results/baseline.json
+    python -m benchmarks.bench_stages --baseline benchmarks/results/baseline.json [--threshold 0.2]
+
+Each stage is timed on its own input (the output of the previous stage), so a slowdown can
+be pinned to PyPDF2, the keyword loop, scikit-learn or the pandas/Plotly report; the report
+stages are the ones talentfit.report.build_report records, as the app runs them. With
+``--baseline`` the run is compared stage by stage and the exit status is 1 when any stage's
+best time is more than ``--threshold`` slower than the baseline's (and by more than
+``--noise-ms``, so sub-millisecond jitter is not reported).
+
+Before timing anything, ``--check`` random texts are scored by both JobScorer and score_skills,
+and matched by both the pure-Python and the pyahocorasick KeywordMatcher (when installed); any
+difference fails the run with exit status 2, since the timings of a fast path that changes the
+scores mean nothing.
+"""
+import argparse
+import io
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from importlib import metadata
+
+from talentfit import matcher
+from talentfit.data import JOB_DESC, SKILLS
+from talentfit.report import build_report
+from talentfit.scoring import FALLBACK_SCORE, calculate_similarity, clean_text, read_pdf, score_skills
+
+from .corpus import FILLER, sample_pdf
+
+SIZES = {"small": 1, "medium": 10, "huge": 150}
+STAGES = ("read_pdf", "clean_text", "keyword_loop", "calculate_similarity", "score_skills",
+          "job_scorer", "dataframe", "plotly", "csv")
+# Timed from the stage timings build_report returns rather than re-implemented here
+REPORT_STAGES = ("dataframe", "plotly", "csv")
+PACKAGES = ("PyPDF2", "scikit-learn", "numpy", "scipy", "pandas", "plotly")
+
+
+def keyword_parts(cv_text, job_desc_clean, skills=SKILLS):
+    """The substring loop of score_skills on its own: ``[(cv_part, jd_part), ...]``."""
+    return [
+        (" ".join([k for k in keywords if k.lower() in cv_text.lower()]),
+         " ".join([k for k in keywords if k.lower() in job_desc_clean.lower()]))
+        for keywords in skills.values()
+    ]
+
+def similarities(parts):
+    return [calculate_similarity(cv, jd) if cv and jd else FALLBACK_SCORE for cv, jd in parts]
+
+def time_stage(fn, repeat, min_sample_s=0.02):
+    """Seconds per call: ``(min, median)`` over ``repeat`` samples of enough calls to last ``min_sample_s``."""
+    start = time.perf_counter()
+    fn()
+    once = time.perf_counter() - start
+    number = max(1, int(min_sample_s / once)) if once > 0 else 1000
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - start) / number)
+    return min(samples), statistics.median(samples)
+
+def time_report(results, repeat, min_sample_s=0.02):
+    """``{stage: (min, median)}`` seconds per call of build_report's own stages, sampled like time_stage."""
+    start = time.perf_counter()
+    build_report(results)
+    once = time.perf_counter() - start
+    number = max(1, int(min_sample_s / once)) if once > 0 else 1000
+    samples = {stage: [] for stage in REPORT_STAGES}
+    for _ in range(repeat):
+        totals = dict.fromkeys(REPORT_STAGES, 0.0)
+        for _ in range(number):
+            stages = build_report(results)[4]
+            for stage in REPORT_STAGES:
+                totals[stage] += stages[stage]["ms"] / 1000
+        for stage in REPORT_STAGES:
+            samples[stage].append(totals[stage] / number)
+    return {stage: (min(s), statistics.median(s)) for stage, s in samples.items()}
+
+
+# -----------------------------
+# Equivalence of the fast paths
+# -----------------------------
+def random_texts(n, seed=0):
+    """Cleaned texts with no keywords at all (the fallback score) up to mostly keywords, mixed
+    case, with keywords and keyword halves glued to their neighbours or split by punctuation."""
+    rng = random.Random(seed)
+    keywords = [k for keywords in SKILLS.values() for k in keywords]
+    pieces = keywords + [k[:len(k) // 2] for k in keywords]
+    texts = []
+    for _ in range(n):
+        density = rng.choice((0.0, 0.0, 0.02, 0.1, 0.5))
+        words = [rng.choice(pieces) if rng.random() < density else rng.choice(FILLER)
+                 for _ in range(rng.randint(0, 400))]
+        words = [rng.choice((str.lower, str.upper, str.title))(w) for w in words]
+        text = "".join(w + rng.choice((" ", " ", " ", "", "-", "/", "\n")) for w in words)
+        texts.append(clean_text(text))
+    return texts
+
+def check_equivalence(n, seed=0):
+    """``[(check, text), ...]`` for every random text on which a fast path differs from its reference."""
+    from talentfit.vectors import JobScorer
+
+    texts = random_texts(n, seed)
+    job_desc_clean = clean_text(JOB_DESC)
+    scorer = JobScorer()
+    failures = [("job_scorer", t) for t in texts if scorer.score(t) != score_skills(t, job_desc_clean)]
+    if matcher.ahocorasick is not None:
+        python = matcher.KeywordMatcher.from_skills(SKILLS, native=False)
+        native = matcher.KeywordMatcher.from_skills(SKILLS, native=True)
+        failures += [("aho_corasick", t) for t in texts if sorted(python.find_all(t)) != sorted(native.find_all(t))]
+    return failures
+
+
+# -----------------------------
+# Suite
+# -----------------------------
+def run(sizes=SIZES, repeat=5):
+    from talentfit.vectors import JobScorer
+
+    scorer = JobScorer()
+    job_desc_clean = clean_text(JOB_DESC)
+    results = {}
+    for size, n_pages in sizes.items():
+        data = sample_pdf(n_pages)
+        raw = read_pdf(io.BytesIO(data))
+        cv_text = clean_text(raw)
+        parts = keyword_parts(cv_text, job_desc_clean)
+        skill_scores = score_skills(cv_text, job_desc_clean)
+
+        stages = {
+            "read_pdf": lambda: read_pdf(io.BytesIO(data)),
+            "clean_text": lambda: clean_text(raw),
+            "keyword_loop": lambda: keyword_parts(cv_text, job_desc_clean),
+            "calculate_similarity": lambda: similarities(parts),
+            "score_skills": lambda: score_skills(cv_text, job_desc_clean),
+            "job_scorer": lambda: scorer.score(cv_text),
+        }
+        timed = {stage: time_stage(fn, repeat) for stage, fn in stages.items()}
+        timed.update(time_report(skill_scores, repeat))
+        results[size] = {"pages": n_pages, "pdf_bytes": len(data), "chars": len(cv_text), "stages": {}}
+        for stage in STAGES:
+            best, median = timed[stage]
+            results[size]["stages"][stage] = {"min_ms": round(best * 1000, 4), "median_ms": round(median * 1000, 4)}
+    return results
+
+def environment():
+    versions = {}
+    for name in PACKAGES:
+        try:
+            versions[name] = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            versions[name] = None
+    return {"python": platform.python_version(), "machine": platform.machine(), "packages": versions}
+
+def compare(current, baseline, threshold, noise_ms=0.0):
+    """``[(size, stage, baseline_ms, current_ms, ratio)]`` for every stage slower than ``1 + threshold``."""
+    regressions = []
+    for size, entry in current.items():
+        base_stages = baseline.get(size, {}).get("stages", {})
+        for stage, timing in entry["stages"].items():
+            base = base_stages.get(stage)
+            if not base or not base["min_ms"]:
+                continue
+            ratio = timing["min_ms"] / base["min_ms"]
+            if ratio > 1 + threshold and timing["min_ms"] - base["min_ms"] > noise_ms:
+                regressions.append((size, stage, base["min_ms"], timing["min_ms"], round(ratio, 2)))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=list(SIZES))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--save", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="flag stages slower than the baseline by more than this fraction")
+    parser.add_argument("--noise-ms", type=float, default=0.25,
+                        help="ignore slowdowns smaller than this many milliseconds")
+    parser.add_argument("--check", type=int, default=500, metavar="N",
+                        help="random texts to check the fast paths against their references on (0: skip)")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        failures = check_equivalence(args.check)
+        for check, text in failures[:5]:
+            print(f"MISMATCH {check}: {text[:120]!r}")
+        if failures:
+            print(f"{len(failures)} mismatches; fast paths differ from their references")
+            return 2
+        print(f"fast paths match their references on {args.check} random texts"
+              + ("" if matcher.ahocorasick is not None else " (pyahocorasick not installed; matcher not compared)"))
+
+    results = run({size: SIZES[size] for size in args.sizes}, args.repeat)
+    report = {"environment": environment(), "results": results}
+
+    print(f"{'size':>7} {'stage':>21} {'min ms':>11} {'median ms':>11}")
+    for size, entry in results.items():
+        for stage, timing in entry["stages"].items():
+            print(f"{size:>7} {stage:>21} {timing['min_ms']:>11.3f} {timing['median_ms']:>11.3f}")
+    if args.save:
+        with open(args.save, "w") as fh:
+            json.dump(report, fh, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as fh:
+            baseline = json.load(fh)
+        packages = report["environment"]["packages"]
+        for name, old in baseline.get("environment", {}).get("packages", {}).items():
+            if packages.get(name) != old:
+                print(f"{name}: {old} -> {packages.get(name)}")
+        regressions = compare(results, baseline["results"], args.threshold, args.noise_ms)
+        for size, stage, base_ms, ms, ratio in regressions:
+            print(f"REGRESSION {size}/{stage}: {base_ms:.3f} -> {ms:.3f} ms ({ratio}x)")
+        if regressions:
+            return 1
+        print(f"no stage slower than the baseline by more than {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
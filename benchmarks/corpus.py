@@ -0,0 +1,267 @@
+"""Seeded generator of synthetic CV PDFs for load and scaling tests.
+
+    python -m benchmarks.corpus -o /tmp/corpus -n 100000 --seed 0 [--pages 1 300] [-j 8]
+    python -m benchmarks.corpus --verify /tmp/corpus [--limit 200]
+
+Document ``i`` of seed ``s`` is always the same PDF, whatever ``-n`` or the number of workers:
+page count (log-uniform within ``--pages``), text density, keyword density (keywords drawn
+from the skills taxonomy), font and layout are all drawn from ``random.Random(f"{s}:{i}")``.
+The text is made-up CV prose, never real data.
+
+PDFs go to ``<out>/<shard>/cv_<i>.pdf`` (1000 per shard directory). ``manifest.jsonl`` holds
+one record per document with its parameters and ``expected_hits``, the taxonomy keywords
+``score_skills`` finds in the extracted text, so correctness can be checked alongside speed.
+"""
+import argparse
+import io
+import json
+import math
+import os
+import random
+import sys
+import time
+from multiprocessing import Pool
+from pathlib import Path
+
+from talentfit.data import SKILLS
+from talentfit.matcher import KeywordMatcher
+from talentfit.scoring import clean_text
+
+from .pdfwriter import BOLD_FONTS, FONTS, PAGE_HEIGHT, PAGE_WIDTH, make_pdf, make_text_pdf, text_block
+
+LAYOUTS = ("plain", "sections", "two_column")
+SHARD_SIZE = 1000
+MARGIN = 40
+
+_WORDS = """
+experience team led delivered managed stakeholders across responsible for the and of with in
+budget revenue client clients customer customers quarterly reporting analysis analyst senior
+junior lead manager director associate consultant advisor office operations strategy planning
+process processes review reviews audit audits policy policies procedures control controls
+finance legal counsel contracts negotiation vendor vendors supplier suppliers portfolio market
+markets growth performance metrics improved reduced increased launched established built
+designed prepared supported advised presented coordinated drove owned partnered evaluated
+health sciences devices hospital clinical product products quality standards documentation
+annual monthly weekly europe asia americas office board executive committee member members
+degree university bachelor master thesis research award languages english german french
+spanish fluent native certified professional years role roles company companies group
+""".split()
+# Filler of the quick samples below; keywords make up about a third of their words
+FILLER = "experience team led delivered managed stakeholders across responsible for the and of with in".split()
+_SECTION_TITLES = ("Profile", "Experience", "Education", "Skills", "Projects", "Certifications",
+                   "Languages", "Awards", "Publications", "References", "Summary", "Volunteering")
+
+
+def _without_keywords(words, skills):
+    """Drop words that contain a taxonomy keyword, so keyword density is controlled by the generator."""
+    keywords = KeywordMatcher.from_skills(skills)
+    return [w for w in words if not keywords.hits(w)]
+
+def _draw_pages(rng, low, high):
+    return min(high, max(low, int(math.exp(rng.uniform(math.log(low), math.log(high + 1))))))
+
+def _wrap(words, width):
+    lines, line = [], ""
+    for word in words:
+        if line and len(line) + 1 + len(word) > width:
+            lines.append(line)
+            line = word
+        else:
+            line = f"{line} {word}" if line else word
+    return lines + ([line] if line else [])
+
+
+class CorpusGenerator:
+    """Draws documents; ``document(i)`` returns ``(pdf_bytes, manifest_record)``."""
+
+    def __init__(self, seed=0, pages=(1, 300), density=(0.3, 1.0), keyword_density=(0.0, 0.05),
+                 fonts=FONTS, layouts=LAYOUTS, skills=SKILLS):
+        self.seed = seed
+        self.pages = pages
+        self.density = density
+        self.keyword_density = keyword_density
+        self.fonts = fonts
+        self.layouts = layouts
+        self.skills = skills
+        self.keywords = sorted({k for keywords in skills.values() for k in keywords})
+        self.filler = _without_keywords(_WORDS, skills)
+        self.titles = _without_keywords(_SECTION_TITLES, skills) or ["Section"]
+        self.matcher = KeywordMatcher.from_skills(skills)
+
+    def document(self, index):
+        rng = random.Random(f"{self.seed}:{index}")
+        params = {
+            "id": index,
+            "pages": _draw_pages(rng, *self.pages),
+            "font": rng.choice(self.fonts),
+            "font_size": rng.choice((9, 10, 11, 12)),
+            "layout": rng.choice(self.layouts),
+            "density": round(rng.uniform(*self.density), 3),
+            "keyword_density": round(rng.uniform(*self.keyword_density), 4),
+        }
+        streams, texts = [], []
+        for page in range(params["pages"]):
+            ops, text = self._page(rng, params, header=f"Candidate {index:06d}" if page == 0 else None)
+            streams.append(ops)
+            texts.append(text)
+        data = make_pdf(streams, {"F1": params["font"], "F2": BOLD_FONTS[params["font"]]})
+        cv_text = clean_text(" ".join(texts))
+        hits = self.matcher.hits(cv_text)
+        params["bytes"] = len(data)
+        params["chars"] = len(cv_text)
+        params["expected_hits"] = {skill: [k for k in keywords if k.lower() in hits]
+                                   for skill, keywords in self.skills.items()}
+        return data, params
+
+    def _words(self, rng, n, keyword_density):
+        return [rng.choice(self.keywords) if rng.random() < keyword_density else rng.choice(self.filler)
+                for _ in range(n)]
+
+    def _page(self, rng, params, header=None):
+        """Content stream and logical text (in content-stream order) of one page."""
+        size = params["font_size"]
+        columns = 2 if params["layout"] == "two_column" else 1
+        gutter = 20 if columns == 2 else 0
+        col_width = (PAGE_WIDTH - 2 * MARGIN - gutter) / columns
+        width = int(col_width / (size * (0.6 if params["font"] == "Courier" else 0.5)))
+        capacity = int((PAGE_HEIGHT - 2 * MARGIN) / (size * 1.2)) - 2
+        n_lines = max(1, int(capacity * params["density"]))
+
+        # (style, line) pairs filling the page top to bottom, column after column
+        lines = [("F2", header)] if header else []
+        while len(lines) < n_lines * columns:
+            if params["layout"] == "sections":
+                lines.append(("F2", rng.choice(self.titles)))
+            words = self._words(rng, rng.randint(8, 20) * max(1, width // 12), params["keyword_density"])
+            lines.extend(("F1", line) for line in _wrap(words, width))
+        lines = lines[:n_lines * columns]
+
+        ops, text = [], []
+        for column in range(columns):
+            x = MARGIN + column * (col_width + gutter)
+            y = PAGE_HEIGHT - MARGIN
+            column_lines = lines[column * n_lines:(column + 1) * n_lines]
+            start = 0
+            while start < len(column_lines):
+                style = column_lines[start][0]
+                end = start
+                while end < len(column_lines) and column_lines[end][0] == style:
+                    end += 1
+                block = [line for _, line in column_lines[start:end]]
+                font_size = size + 2 if style == "F2" else size
+                ops.append(text_block(block, round(x, 1), round(y, 1), style, font_size))
+                text.extend(block)
+                y -= font_size * 1.2 * len(block)
+                start = end
+        return "\n".join(ops), " ".join(text)
+
+
+# -----------------------------
+# Quick samples: keyword-heavy text for the micro-benchmarks
+# -----------------------------
+def _sample_words(rng, n):
+    vocab = FILLER * 4 + [k for keywords in SKILLS.values() for k in keywords]
+    return " ".join(rng.choice(vocab) for _ in range(n))
+
+def sample_text(words, seed=0):
+    return _sample_words(random.Random(seed), words)
+
+def sample_pdf(n_pages, words_per_page=450, seed=0):
+    rng = random.Random(seed)
+    return make_text_pdf([_sample_words(rng, words_per_page) for _ in range(n_pages)])
+
+
+# -----------------------------
+# Writing and verifying a corpus on disk
+# -----------------------------
+_generator = None
+
+def _init(options):
+    global _generator
+    _generator = CorpusGenerator(**options)
+
+def _write_one(args):
+    out_dir, index = args
+    data, record = _generator.document(index)
+    path = Path(f"{index // SHARD_SIZE:03d}") / f"cv_{index:06d}.pdf"
+    (Path(out_dir) / path).write_bytes(data)
+    record["path"] = str(path)
+    return record
+
+def write_corpus(out_dir, n, workers=None, progress=None, **options):
+    """Write ``n`` documents and their manifest; returns the number of PDF bytes written."""
+    out_dir = Path(out_dir)
+    for shard in range(math.ceil(n / SHARD_SIZE)):
+        (out_dir / f"{shard:03d}").mkdir(parents=True, exist_ok=True)
+    total = 0
+    with Pool(workers or os.cpu_count() or 1, initializer=_init, initargs=(options,)) as pool, \
+            open(out_dir / "manifest.jsonl", "w") as manifest:
+        for done, record in enumerate(pool.imap(_write_one, ((str(out_dir), i) for i in range(n)), chunksize=16), 1):
+            manifest.write(json.dumps(record) + "\n")
+            total += record["bytes"]
+            if progress and done % progress == 0:
+                print(f"{done}/{n} documents", file=sys.stderr)
+    return total
+
+def verify(out_dir, limit=None):
+    """Extract documents with read_pdf and compare their keyword hits to the manifest.
+
+    Returns ``(checked, [ids that differ])``.
+    """
+    from talentfit.scoring import read_pdf
+
+    out_dir = Path(out_dir)
+    matcher = KeywordMatcher.from_skills(SKILLS)
+    mismatches, checked = [], 0
+    with open(out_dir / "manifest.jsonl") as manifest:
+        for line in manifest:
+            if limit is not None and checked >= limit:
+                break
+            record = json.loads(line)
+            hits = matcher.hits(clean_text(read_pdf(io.BytesIO((out_dir / record["path"]).read_bytes()))))
+            found = {skill: [k for k in keywords if k.lower() in hits] for skill, keywords in SKILLS.items()}
+            if found != record["expected_hits"]:
+                mismatches.append(record["id"])
+            checked += 1
+    return checked, mismatches
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-o", "--out", help="output directory")
+    parser.add_argument("-n", "--count", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--pages", type=int, nargs=2, default=[1, 300], metavar=("MIN", "MAX"))
+    parser.add_argument("--density", type=float, nargs=2, default=[0.3, 1.0], metavar=("MIN", "MAX"),
+                        help="fraction of each page filled with text")
+    parser.add_argument("--keyword-density", type=float, nargs=2, default=[0.0, 0.05], metavar=("MIN", "MAX"),
+                        help="fraction of words drawn from the skills taxonomy")
+    parser.add_argument("--layouts", nargs="+", choices=LAYOUTS, default=list(LAYOUTS))
+    parser.add_argument("--fonts", nargs="+", choices=FONTS, default=list(FONTS))
+    parser.add_argument("-j", "--workers", type=int, default=None)
+    parser.add_argument("--verify", metavar="DIR", help="check a written corpus against its manifest")
+    parser.add_argument("--limit", type=int, default=None, help="with --verify, check only the first N documents")
+    args = parser.parse_args(argv)
+
+    if args.verify:
+        checked, mismatches = verify(args.verify, args.limit)
+        print(f"{checked} documents checked, {len(mismatches)} with unexpected keyword hits")
+        if mismatches:
+            print("ids: " + " ".join(map(str, mismatches[:50])))
+            return 1
+        return 0
+    if not args.out:
+        parser.error("-o/--out is required unless --verify is given")
+
+    start = time.perf_counter()
+    total = write_corpus(
+        args.out, args.count, args.workers, progress=max(1000, args.count // 20),
+        seed=args.seed, pages=tuple(args.pages), density=tuple(args.density),
+        keyword_density=tuple(args.keyword_density), fonts=tuple(args.fonts), layouts=tuple(args.layouts),
+    )
+    seconds = time.perf_counter() - start
+    print(f"{args.count} documents, {total / 1e6:.1f} MB in {seconds:.1f} s -> {args.out}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
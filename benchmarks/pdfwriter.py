@@ -0,0 +1,57 @@
+"""Minimal dependency-free writer for text-only PDFs used by the benchmarks."""
+
+FONTS = ("Helvetica", "Times-Roman", "Courier")
+BOLD_FONTS = {"Helvetica": "Helvetica-Bold", "Times-Roman": "Times-Bold", "Courier": "Courier-Bold"}
+PAGE_WIDTH, PAGE_HEIGHT = 595, 842
+
+
+def _escape(line):
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+def text_block(lines, x, y, font="F1", font_size=10):
+    """Content-stream operators drawing ``lines`` one below the other, starting under ``(x, y)``."""
+    leading = font_size * 1.2
+    ops = [f"BT /{font} {font_size} Tf {leading:.1f} TL {x} {y} Td"]
+    ops.extend(f"({_escape(line)}) '" for line in lines)
+    ops.append("ET")
+    return "\n".join(ops)
+
+def _page_stream(text, font_size=10, line_chars=90, margin=40, height=PAGE_HEIGHT):
+    lines = [text[i:i + line_chars] for i in range(0, len(text), line_chars)] or [""]
+    return text_block(lines, margin, height - margin, "F1", font_size)
+
+def make_pdf(page_streams, fonts):
+    """Return PDF bytes with one page per content stream; ``fonts`` maps resource names (``F1``) to base fonts."""
+    n = len(page_streams)
+    font_ids = {name: 3 + 2 * n + i for i, name in enumerate(fonts)}
+    font_refs = " ".join(f"/{name} {font_ids[name]} 0 R" for name in fonts)
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        ("<< /Type /Pages /Kids [%s] /Count %d >>" % (" ".join(f"{3 + 2 * i} 0 R" for i in range(n)), n)).encode(),
+    ]
+    for i, ops in enumerate(page_streams):
+        objects.append(
+            (f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] /Contents {4 + 2 * i} 0 R "
+             f"/Resources << /Font << {font_refs} >> >> >>").encode()
+        )
+        stream = ops.encode("latin-1", "replace")
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+    objects.extend(f"<< /Type /Font /Subtype /Type1 /BaseFont /{base} >>".encode() for base in fonts.values())
+    return serialize(objects)
+
+def make_text_pdf(pages, font="Helvetica", font_size=10, line_chars=90):
+    """Return the bytes of a PDF with one page per string in ``pages``."""
+    return make_pdf([_page_stream(text, font_size, line_chars) for text in pages], {"F1": font})
+
+def serialize(objects, root=1):
+    """Assemble numbered objects (1-based, in order) into a PDF file with a valid xref table."""
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for i, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % i + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % off for off in offsets)
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, root, xref)
+    return bytes(out)
@@ -0,0 +1,45 @@
+"""TalentFit scoring engine, importable without Streamlit.
+
+Names are resolved lazily so that importing a light submodule (``talentfit.cache``) does not
+pull in scikit-learn, numpy or PyPDF2.
+"""
+import importlib
+
+_EXPORTS = {
+    "JOB_DESC": "data",
+    "SKILLS": "data",
+    "FALLBACK_SCORE": "scoring",
+    "STRONG_MATCH": "scoring",
+    "calculate_similarity": "scoring",
+    "clean_text": "scoring",
+    "iter_pdf_pages": "scoring",
+    "overall_score": "scoring",
+    "read_pdf": "scoring",
+    "read_pdf_limited": "scoring",
+    "score_pdf": "scoring",
+    "score_skills": "scoring",
+    "score_text": "scoring",
+    "KeywordMatcher": "matcher",
+    "JobIndex": "jobs",
+    "load_jobs": "jobs",
+    "JobProfile": "profile",
+    "load_or_build": "profile",
+    "JobScorer": "vectors",
+    "StageTimings": "timing",
+    "IsolatedPool": "isolation",
+    "available_backends": "backends",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
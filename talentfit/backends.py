@@ -0,0 +1,199 @@
+"""PDF text extraction backends and the probe that routes documents between them.
+
+PyPDF2 stays the default, so scores do not move unless asked to. Faster extractors are used
+when installed and selected by name (``read_pdf(file, backend="pymupdf")``, ``--backend`` on
+the batch CLI), or per document with ``backend="auto"``: a probe of the raw bytes (size, page
+count, whether there is a text layer at all) sends long documents and scans to the fastest
+installed backend and everything else to PyPDF2. No backend module is imported until a
+document needs it.
+
+    python -m benchmarks.bench_backends   # throughput and keyword-hit agreement with PyPDF2
+"""
+import abc
+import functools
+import importlib.util
+import io
+import re
+
+from . import timing
+
+DEFAULT_BACKEND = "pypdf2"
+AUTO = "auto"
+# Documents above either bound take the fast path under "auto"
+FAST_PATH_PAGES = 20
+FAST_PATH_BYTES = 2 * 1024 * 1024
+
+
+class Backend(abc.ABC):
+    """One extractor: ``open`` a PDF, iterate its ``pages`` and get each ``page_text``."""
+
+    name = ""
+    module = ""
+
+    def available(self):
+        return importlib.util.find_spec(self.module) is not None
+
+    @abc.abstractmethod
+    def open(self, file):
+        """The parsed document of a binary file object."""
+
+    @abc.abstractmethod
+    def pages(self, document, max_pages=None):
+        """The document's pages in order, at most ``max_pages`` of them."""
+
+    def page_count(self, document):
+        return sum(1 for _ in self.pages(document))
+
+    @abc.abstractmethod
+    def page_text(self, page):
+        """The text of one page."""
+
+
+class PyPDF2Backend(Backend):
+    name = "pypdf2"
+    module = "PyPDF2"
+
+    def open(self, file):
+        import PyPDF2  # heavy; imported on first extraction, not at app start-up
+
+        return PyPDF2.PdfReader(file)
+
+    def pages(self, document, max_pages=None):
+        return document.pages if max_pages is None else document.pages[:max_pages]
+
+    def page_count(self, document):
+        return len(document.pages)
+
+    def page_text(self, page):
+        return page.extract_text()
+
+
+class PypdfBackend(PyPDF2Backend):
+    """pypdf, PyPDF2's maintained successor: same API, faster content-stream parsing."""
+
+    name = "pypdf"
+    module = "pypdf"
+
+    def open(self, file):
+        import pypdf
+
+        return pypdf.PdfReader(file)
+
+
+class PyMuPDFBackend(Backend):
+    name = "pymupdf"
+    module = "pymupdf"
+
+    def available(self):
+        return super().available() or importlib.util.find_spec("fitz") is not None  # before PyMuPDF 1.24
+
+    def open(self, file):
+        try:
+            import pymupdf
+        except ImportError:
+            import fitz as pymupdf
+
+        return pymupdf.open(stream=_data(file), filetype="pdf")
+
+    def pages(self, document, max_pages=None):
+        n = document.page_count if max_pages is None else min(document.page_count, max_pages)
+        return (document[i] for i in range(n))
+
+    def page_count(self, document):
+        return document.page_count
+
+    def page_text(self, page):
+        return page.get_text()
+
+
+class PdfiumBackend(Backend):
+    name = "pypdfium2"
+    module = "pypdfium2"
+
+    def open(self, file):
+        import pypdfium2
+
+        return pypdfium2.PdfDocument(_data(file))
+
+    def pages(self, document, max_pages=None):
+        n = len(document) if max_pages is None else min(len(document), max_pages)
+        return (document[i] for i in range(n))
+
+    def page_count(self, document):
+        return len(document)
+
+    def page_text(self, page):
+        return page.get_textpage().get_text_range()
+
+
+# Fastest first; "auto" takes the first one installed for its fast path
+BACKENDS = {b.name: b for b in (PyMuPDFBackend(), PdfiumBackend(), PypdfBackend(), PyPDF2Backend())}
+
+@functools.lru_cache(maxsize=None)
+def available_backends():
+    return tuple(name for name, backend in BACKENDS.items() if backend.available())
+
+def get_backend(name=None):
+    backend = BACKENDS.get(name or DEFAULT_BACKEND)
+    if backend is None:
+        raise ValueError(f"unknown PDF backend {name!r}; choose from {', '.join(BACKENDS)} or {AUTO}")
+    if not backend.available():
+        raise ImportError(f"PDF backend {name!r} needs the {backend.module} package")
+    return backend
+
+def _data(file):
+    from .cache import file_bytes  # cache imports scoring, which imports this module
+
+    return file_bytes(file)
+
+
+# -----------------------------
+# Probe and routing
+# -----------------------------
+_PAGE_OBJECT = re.compile(rb"/Type\s*/Page(?![A-Za-z])")
+_PAGE_COUNT = re.compile(rb"/Count\s+(\d+)")
+
+
+class Probe:
+    """What the raw bytes tell about a PDF without parsing it.
+
+    ``pages`` and ``text_layer`` are None when the answer is hidden in compressed object streams.
+    """
+
+    __slots__ = ("size", "pages", "text_layer")
+
+    def __init__(self, size, pages, text_layer):
+        self.size = size
+        self.pages = pages
+        self.text_layer = text_layer
+
+    def __repr__(self):
+        return f"Probe(size={self.size}, pages={self.pages}, text_layer={self.text_layer})"
+
+def probe(data):
+    pages = len(_PAGE_OBJECT.findall(data))
+    if not pages:
+        # Page objects inside object streams; the root page tree's /Count is the largest one
+        pages = max((int(n) for n in _PAGE_COUNT.findall(data)), default=None)
+    if b"/Font" in data:
+        text_layer = True
+    else:
+        text_layer = None if b"/ObjStm" in data else False
+    return Probe(len(data), pages, text_layer)
+
+def route(info, available=None):
+    """Backend name for a probed document: the fastest installed one for scans and long documents."""
+    available = available_backends() if available is None else available
+    fastest = next((name for name in BACKENDS if name in available), DEFAULT_BACKEND)
+    if info.text_layer is False or (info.pages or 0) > FAST_PATH_PAGES or info.size > FAST_PATH_BYTES:
+        return fastest
+    return DEFAULT_BACKEND
+
+def resolve(name, file):
+    """``(Backend, file)`` for an extraction; ``"auto"`` probes the bytes and returns them re-wrapped."""
+    if name != AUTO:
+        return get_backend(name), file
+    data = _data(file)
+    with timing.stage("pdf_probe", bytes=len(data)):
+        chosen = route(probe(data))
+    return get_backend(chosen), io.BytesIO(data)
@@ -0,0 +1,86 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from . import batch, metrics
+from .isolation import DEFAULT_MAX_RSS_MB, DEFAULT_MAX_TASKS, DEFAULT_MEMORY_LIMIT_MB, DEFAULT_TIMEOUT, IsolatedPool
+
+QUEUED, SCORING, DONE, FAILED = "queued", "scoring", "done", "failed"
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+
+
+class QueueFull(RuntimeError):
+    """More CVs are waiting than the queue accepts; submit again once some have finished."""
+
+
+class ScoringQueue:
+    """Bounded background executor that scores uploaded CVs while the UI keeps running.
+
+    Work runs on killable worker processes that hold the compiled job profile (see
+    ``batch._init_worker`` and talentfit.isolation): a CV that takes longer than ``timeout``
+    seconds fails with a DocumentTimeout row instead of occupying a worker for good.
+    Submissions are de-duplicated by key, at most ``max_pending`` CVs wait at a time, and the
+    last ``max_results`` finished rows are kept so reruns and other sessions can read them back
+    without re-scoring.
+    """
+
+    def __init__(self, profile, workers=DEFAULT_WORKERS, max_pending=200, max_results=2000,
+                 cache_path=None, budget=(None, None), timeout=DEFAULT_TIMEOUT,
+                 memory_limit_mb=DEFAULT_MEMORY_LIMIT_MB, max_tasks=DEFAULT_MAX_TASKS, max_rss_mb=DEFAULT_MAX_RSS_MB):
+        self.max_pending = max_pending
+        self.max_results = max_results
+        self._executor = IsolatedPool(workers, batch._init_worker, (profile, cache_path, budget), timeout,
+                                      memory_limit_mb, max_tasks, max_rss_mb)
+        self._pending = {}
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, key, name, data, trace=False):
+        """Queue ``data`` (PDF bytes) under ``key`` unless it is already queued or scored.
+
+        With ``trace`` the finished row carries the Chrome trace events of its run (``row["Trace"]``).
+        """
+        with self._lock:
+            if key in self._pending:
+                return
+            if key in self._results:
+                self._results.move_to_end(key)
+                return
+            if len(self._pending) >= self.max_pending:
+                raise QueueFull(f"{len(self._pending)} CVs are already waiting")
+            future = self._executor.submit(batch._score_path, data, name, trace)
+            self._pending[key] = future
+        submitted = time.perf_counter()
+        future.add_done_callback(lambda f, key=key: self._finish(key, f, submitted))
+
+    def _finish(self, key, future, submitted):
+        try:
+            row = future.result()
+        except Exception as exc:  # timeout, worker crash, pool shut down, ...
+            row = {"Overall Match %": None, "Error": f"{type(exc).__name__}: {exc}"}
+        metrics.observe_document(row)
+        metrics.END_TO_END_SECONDS.observe(time.perf_counter() - submitted)
+        with self._lock:
+            self._pending.pop(key, None)
+            self._results[key] = row
+            while len(self._results) > self.max_results:
+                self._results.popitem(last=False)
+
+    def status(self, key):
+        """``(state, row)``; ``row`` is the results-table row once the CV has been scored."""
+        with self._lock:
+            row = self._results.get(key)
+            if row is not None:
+                return (FAILED if row.get("Error") else DONE), row
+            future = self._pending.get(key)
+        if future is None:
+            return None, None
+        return (SCORING if future.running() else QUEUED), None
+
+    def pending(self):
+        with self._lock:
+            return len(self._pending)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,382 @@
+import argparse
+import glob
+import hashlib
+import io
+import os
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+from . import isolation, timing
+from .backends import AUTO, BACKENDS, DEFAULT_BACKEND
+from .cache import DEFAULT_CACHE_PATH, open_cache, read_pdf_cached
+from .data import JOB_DESC, SKILLS
+from .isolation import IsolatedPool
+from .profile import load_or_build
+from .scoring import clean_text, iter_pdf_pages, overall_score, read_pdf, read_pdf_limited
+from .vectors import JobScorer
+
+# -----------------------------
+# Input discovery
+# -----------------------------
+def find_pdfs(inputs):
+    """Expand directories (recursively), glob patterns and plain file paths into a sorted list of PDFs.
+
+    Directories and patterns yield only ``.pdf`` files; a file named explicitly is taken as given.
+    """
+    found = set()
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            found.update(p for p in path.rglob("*") if p.suffix.lower() == ".pdf" and p.is_file())
+        elif path.is_file():
+            found.add(path)
+        else:
+            found.update(Path(p) for p in glob.glob(item, recursive=True)
+                         if Path(p).suffix.lower() == ".pdf" and Path(p).is_file())
+    return sorted(found)
+
+
+# -----------------------------
+# Worker side
+# -----------------------------
+_scorer = None
+_cache = None
+_budget = (None, None)
+_trace = (None, 1.0)
+_memory = False
+_backend = None
+
+def _init_worker(profile, cache_path=None, budget=(None, None), trace=(None, 1.0), memory=False, backend=None):
+    """``trace`` is ``(directory, sample fraction)``: where to write Chrome traces of scored PDFs.
+
+    ``memory`` turns on tracemalloc so rows also report peak memory, per stage and per document.
+    ``backend`` is the PDF extraction backend (see talentfit.backends).
+    """
+    global _scorer, _cache, _budget, _trace, _memory, _backend
+    _scorer = JobScorer(profile=profile)
+    _cache = open_cache(cache_path)
+    _budget = budget
+    _trace = trace
+    _memory = memory
+    _backend = backend
+    if memory and not tracemalloc.is_tracing():
+        import PyPDF2  # noqa: F401  (so the first CV's peak is not the import's)
+
+        tracemalloc.start()
+
+def _extract(file):
+    return read_pdf(file, _backend)
+
+def _extract_limited(file):
+    return read_pdf_limited(file, *_budget, _backend)
+
+def _cache_variant():
+    """Cache-key suffix for text extracted differently from a plain PyPDF2 read_pdf."""
+    parts = []
+    if _budget != (None, None):
+        parts.append("pages={}:chars={}".format(*_budget))
+    if _backend not in (None, DEFAULT_BACKEND):
+        parts.append(f"backend={_backend}")
+    return ":".join(parts)
+
+def _open(source):
+    with timing.stage("upload_read") as span:
+        data = source if isinstance(source, bytes) else Path(source).read_bytes()
+        span.bytes = len(data)
+    return io.BytesIO(data)
+
+def _score_document(source):
+    limited = _budget != (None, None)
+    if _cache is not None:
+        if limited:
+            return _scorer.score(read_pdf_cached(source, _cache, extract=_extract_limited, variant=_cache_variant()))
+        return _scorer.score(clean_text(read_pdf_cached(source, _cache, extract=_extract, variant=_cache_variant())))
+    with _open(source) as fh:
+        if limited:
+            return _scorer.score_pages(iter_pdf_pages(fh, *_budget, _backend))
+        return _scorer.score(clean_text(read_pdf(fh, _backend)))
+
+def _result_row(name, score, timings=None):
+    """Run ``score`` and format its results as a table row.
+
+    ``row["Timings"]`` holds the per-stage timings of the run (see talentfit.timing); it is not
+    a column of the results table. When the worker tracks memory, the row also gets the
+    document's peak traced memory and the worker's RSS after it.
+    """
+    row = {"File": name}
+    if timings is None:
+        timings = timing.StageTimings(memory=_memory)
+    with timing.recording(timings), timing.peak_memory() as memory:
+        try:
+            results = score()
+            row["Overall Match %"] = overall_score(results)
+            row.update({skill: score for skill, score in results})
+            row["Error"] = ""
+        except Exception as exc:  # one broken PDF must not abort the whole batch
+            row["Overall Match %"] = None
+            row["Error"] = f"{type(exc).__name__}: {exc}"
+    if _memory:
+        row["Peak Memory MB"] = round(memory.peak_bytes / 1e6, 2)
+        row["Worker RSS MB"] = round(timing.rss_bytes() / 1e6, 1)
+    row["Timings"] = timings.as_dict()
+    return row
+
+def _trace_path(name):
+    """Trace file for ``name`` when it falls in the sample (chosen by hash, so reruns pick the same PDFs)."""
+    trace_dir, fraction = _trace
+    digest = hashlib.sha1(name.encode()).hexdigest()
+    if trace_dir is None or int(digest[:8], 16) >= fraction * 0x100000000:
+        return None
+    return Path(trace_dir) / f"{Path(name).stem}-{digest[:8]}.trace.json"
+
+def _score_path(source, name=None, trace=False):
+    """Score a PDF given as a path or as raw bytes; returns one row of the results table.
+
+    With ``trace`` the row carries the run's Chrome trace events in ``row["Trace"]``; sampled
+    documents of a traced batch have theirs written to the trace directory instead.
+    """
+    name = name or str(source)
+    path = None if trace else _trace_path(name)
+    if not trace and path is None:
+        return _result_row(name, lambda: _score_document(source))
+    with timing.tracing() as tracer, timing.span("score_document", {"file": name}):
+        row = _result_row(name, lambda: _score_document(source))
+    if trace:
+        row["Trace"] = tracer.events
+    else:
+        tracer.save(path)
+    return row
+
+def _failed_row(name, exc):
+    """Row for a document whose worker never returned one (timed out or crashed)."""
+    return {"File": name, "Overall Match %": None, "Error": f"{type(exc).__name__}: {exc}", "Timings": {}}
+
+def _score_text(text, name=""):
+    """Score already extracted CV text; returns one row of the results table."""
+    return _result_row(name, lambda: _scorer.score(clean_text(text)))
+
+def _score_texts(texts, names):
+    """_score_text for many CVs at once, through one JobScorer.score_many call.
+
+    The rows' timings are those of the whole batch.
+    """
+    try:
+        with timing.recording() as timings:
+            all_results = _scorer.score_many([clean_text(t) for t in texts])
+    except Exception:  # fall back to one by one so a bad item only fails itself
+        return [_score_text(t, n) for t, n in zip(texts, names)]
+    return [_result_row(name, lambda r=results: r, timing.StageTimings(timings.as_dict()))
+            for name, results in zip(names, all_results)]
+
+
+# -----------------------------
+# Batch engine
+# -----------------------------
+MEMORY_COLUMNS = ("Peak Memory MB", "Worker RSS MB")
+
+def rank_results(rows, skills=SKILLS, memory=False):
+    """Rows ranked by overall match; ``memory`` adds MEMORY_COLUMNS (empty for failed documents)."""
+    columns = ["File", "Overall Match %", *skills.keys(), *(MEMORY_COLUMNS if memory else ()), "Error"]
+    df = pd.DataFrame(rows, columns=columns)
+    df = df.sort_values(["Overall Match %", "File"], ascending=[False, True], na_position="last")
+    df = df.reset_index(drop=True)
+    df.insert(0, "Rank", df.index + 1)
+    return df
+
+def score_batch(paths, job_desc=JOB_DESC, skills=SKILLS, workers=None, chunksize=None, cache_path=None,
+                max_pages=None, max_chars=None, trace_dir=None, trace_sample=1.0, memory=False,
+                timeout=None, memory_limit_mb=None, max_tasks_per_worker=None, max_rss_mb=None, backend=None):
+    """Score every PDF in ``paths`` and return ``(ranked DataFrame, stats dict)``.
+
+    ``max_pages`` / ``max_chars`` bound how much of each document is read (see iter_pdf_pages).
+    With ``trace_dir``, a Chrome trace is written there for a ``trace_sample`` fraction of the PDFs.
+    ``memory`` adds peak-memory columns to the table, ``peak_bytes`` to the stage timings and a
+    ``stats["memory"]`` summary; tracemalloc makes the run several times slower.
+
+    Any of ``timeout`` (seconds per PDF), ``memory_limit_mb`` (address space per worker),
+    ``max_tasks_per_worker`` or ``max_rss_mb`` runs the PDFs on a talentfit.isolation.IsolatedPool,
+    even with one worker: a PDF that hangs or crashes its worker gets an error row
+    (``DocumentTimeout: ...`` / ``WorkerCrashed: ...``) and the batch carries on. When no worker
+    can start, every PDF gets the initializer's error (``WorkerStartFailed: ...``).
+    ``backend`` picks the PDF extractor, or "auto" to route each PDF (see talentfit.backends).
+    """
+    paths = list(paths)
+    # JD-side work happens once here; workers receive the finished profile
+    profile = load_or_build(job_desc=job_desc, skills=skills)
+    if trace_dir is not None:
+        Path(trace_dir).mkdir(parents=True, exist_ok=True)
+    init_args = (profile, cache_path, (max_pages, max_chars), (trace_dir, trace_sample), memory, backend)
+    started_tracemalloc = memory and not tracemalloc.is_tracing()
+    workers = workers or os.cpu_count() or 1
+    if chunksize is None:
+        chunksize = max(1, len(paths) // (workers * 8))
+
+    isolated = any(v is not None for v in (timeout, memory_limit_mb, max_tasks_per_worker, max_rss_mb))
+    pool_stats = None
+    start = time.perf_counter()
+    if isolated:
+        with IsolatedPool(workers, _init_worker, init_args, timeout, memory_limit_mb, max_tasks_per_worker,
+                          max_rss_mb) as pool:
+            futures = [pool.submit(_score_path, p) for p in paths]
+            rows = []
+            for path, future in zip(paths, futures):
+                try:
+                    rows.append(future.result())
+                except Exception as exc:
+                    rows.append(_failed_row(str(path), exc))
+        pool_stats = pool.stats()
+    elif workers == 1:
+        _init_worker(*init_args)
+        rows = [_score_path(p) for p in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=init_args) as pool:
+            rows = list(pool.map(_score_path, paths, chunksize=chunksize))
+    elapsed = time.perf_counter() - start
+
+    if started_tracemalloc and not tracemalloc.is_tracing():
+        tracemalloc.start()  # for the results DataFrame, built here in the parent
+    stages = timing.StageTimings(memory=memory)
+    with timing.recording(stages), timing.stage("dataframe"):
+        df = rank_results(rows, skills, memory)
+    for row in rows:
+        stages.merge(row["Timings"])
+    stats = {
+        "documents": len(paths),
+        "failed": int((df["Error"] != "").sum()),
+        "workers": workers,
+        "seconds": round(elapsed, 3),
+        "docs_per_sec": round(len(paths) / elapsed, 2) if elapsed > 0 else 0.0,
+        # summed over all documents and workers, so it can exceed the wall-clock seconds
+        "stages": stages.as_dict(),
+    }
+    if pool_stats is not None:
+        stats["timeouts"] = pool_stats["timeouts"]
+        stats["workers_started"] = pool_stats["started"]
+        stats["workers_recycled"] = pool_stats["recycled"]
+        stats["worker_crashes"] = pool_stats["crashes"]
+    if memory:
+        if started_tracemalloc:
+            tracemalloc.stop()
+        stats["memory"] = memory_summary(df)
+    return df, stats
+
+def memory_summary(df, top=5):
+    """Largest per-document peaks (traced memory) and worker RSS of a ``memory=True`` batch.
+
+    Failed documents have no measurements; the figures are None when no document has any.
+    """
+    df = df.dropna(subset=["Peak Memory MB"]).astype({c: float for c in MEMORY_COLUMNS})
+    if df.empty:
+        return {"max_document_peak_mb": None, "mean_document_peak_mb": None, "max_worker_rss_mb": None,
+                "heaviest": []}
+    heaviest = df.nlargest(top, "Peak Memory MB")
+    return {
+        "max_document_peak_mb": float(df["Peak Memory MB"].max()),
+        "mean_document_peak_mb": round(float(df["Peak Memory MB"].mean()), 2),
+        "max_worker_rss_mb": float(df["Worker RSS MB"].max()),
+        "heaviest": [{"file": f, "peak_mb": float(mb)} for f, mb in zip(heaviest["File"], heaviest["Peak Memory MB"])],
+    }
+
+
+# -----------------------------
+# CLI
+# -----------------------------
+def write_table(df, output):
+    if output.endswith(".parquet"):
+        df.to_parquet(output, index=False)
+    elif output.endswith((".xlsx", ".xls")):
+        df.to_excel(output, index=False)
+    else:
+        df.to_csv(output, index=False)
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="talentfit", description="Score a batch of CV PDFs against the job description.")
+    parser.add_argument("inputs", nargs="+", help="PDF files, directories or glob patterns")
+    parser.add_argument("-o", "--output", default="cv_ranking.csv", help="results table (.csv, .parquet or .xlsx)")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--chunksize", type=int, default=None, help="PDFs handed to a worker at a time")
+    parser.add_argument("--cache", default=str(DEFAULT_CACHE_PATH), help="SQLite cache of extracted text")
+    parser.add_argument("--no-cache", action="store_true", help="always re-extract PDF text")
+    parser.add_argument("--max-pages", type=int, default=None, help="read at most this many pages per CV")
+    parser.add_argument("--max-chars", type=int, default=None, help="read at most this many characters per CV")
+    parser.add_argument("--backend", choices=[*BACKENDS, AUTO], default=DEFAULT_BACKEND,
+                        help="PDF text extractor; 'auto' sends long CVs and scans to the fastest one installed")
+    parser.add_argument("--timings", action="store_true", help="print where the time went, stage by stage")
+    parser.add_argument("--trace-dir", default=None, help="write a Chrome trace (JSON) per scored PDF here")
+    parser.add_argument("--trace-sample", type=float, default=1.0,
+                        help="with --trace-dir, trace only this fraction of the PDFs (picked by file name)")
+    parser.add_argument("--profile", action="store_true",
+                        help="run in-process under cProfile, without the text cache so every PDF is extracted; "
+                             "stats are saved next to the output table")
+    isolation.add_arguments(parser)
+    parser.add_argument("--no-isolation", action="store_true",
+                        help="score in a plain process pool (or in-process with -j 1): no timeout, limits or recycling")
+    parser.add_argument("--memory", action="store_true",
+                        help="track peak memory per stage and per CV with tracemalloc (slower); adds table columns")
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    paths = find_pdfs(args.inputs)
+    if not paths:
+        print("No PDF files found.", file=sys.stderr)
+        return 1
+
+    # A profiled run answered from the cache would show no extraction at all
+    cache_path = None if args.no_cache or args.profile else args.cache
+    options = dict(workers=args.workers, chunksize=args.chunksize, cache_path=cache_path,
+                   max_pages=args.max_pages, max_chars=args.max_chars,
+                   trace_dir=args.trace_dir, trace_sample=args.trace_sample, memory=args.memory,
+                   backend=args.backend)
+    if not args.no_isolation and not args.profile:
+        timeout, memory_limit_mb, max_tasks, max_rss_mb = isolation.limits(args)
+        options.update(timeout=timeout, memory_limit_mb=memory_limit_mb, max_tasks_per_worker=max_tasks,
+                       max_rss_mb=max_rss_mb)
+    if args.profile:
+        from .profiling import profiling
+
+        # cProfile only sees this process, so the workers' share of the run is done here
+        options["workers"] = 1
+        with profiling() as run:
+            df, stats = score_batch(paths, **options)
+            write_table(df, args.output)
+        prof, txt = run.save(Path(args.output).with_suffix(""))
+        print(f"Profile: {prof}, top functions: {txt}", file=sys.stderr)
+    else:
+        df, stats = score_batch(paths, **options)
+        write_table(df, args.output)
+    print(
+        f"Scored {stats['documents']} CVs ({stats['failed']} failed) with {stats['workers']} workers "
+        f"in {stats['seconds']}s - {stats['docs_per_sec']} docs/sec -> {args.output}",
+        file=sys.stderr,
+    )
+    if stats.get("timeouts") or stats.get("worker_crashes") or stats.get("workers_recycled"):
+        print(f"{stats['timeouts']} timed out, {stats['worker_crashes']} worker crashes, "
+              f"{stats['workers_recycled']} workers recycled", file=sys.stderr)
+    if args.timings or args.memory:
+        print(f"{'stage':>18} {'calls':>8} {'total ms':>11} {'slowest ms':>11} {'MB':>9} {'chars':>12}"
+              + (f" {'peak MB':>9}" if args.memory else ""), file=sys.stderr)
+        for name, e in stats["stages"].items():
+            peak = f" {e['peak_bytes'] / 1e6:>9.2f}" if "peak_bytes" in e else ""
+            print(f"{name:>18} {e['calls']:>8} {e['ms']:>11.1f} {e['max_ms']:>11.1f} {e['bytes'] / 1e6:>9.2f} "
+                  f"{e['chars']:>12,}{peak}", file=sys.stderr)
+    if args.memory:
+        mem = stats["memory"]
+        if not mem["heaviest"]:
+            print("No memory figures: no CV finished in its worker", file=sys.stderr)
+            return 0
+        print(f"Peak traced memory per CV: max {mem['max_document_peak_mb']} MB, mean {mem['mean_document_peak_mb']} MB; "
+              f"largest worker RSS {mem['max_worker_rss_mb']} MB", file=sys.stderr)
+        for item in mem["heaviest"]:
+            print(f"{item['peak_mb']:>9.2f} MB  {item['file']}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,20 @@
+"""Precompile the job-description profile: python -m talentfit.build_profile [-o PATH]"""
+import argparse
+import sys
+
+from .profile import DEFAULT_PROFILE_PATH, SCHEMA_VERSION, JobProfile
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompile the job-description profile used for scoring.")
+    parser.add_argument("-o", "--output", default=str(DEFAULT_PROFILE_PATH))
+    args = parser.parse_args(argv)
+    profile = JobProfile.build()
+    profile.save(args.output)
+    hits = sum(len(v) for v in profile.jd_hits.values())
+    print(f"Wrote {args.output}: {hits} keyword hits, {len(profile.vocabulary)} terms, schema {SCHEMA_VERSION}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+import hashlib
+import io
+import os
+import sqlite3
+import threading
+import time
+import warnings
+from pathlib import Path
+
+from . import timing
+from .scoring import read_pdf
+
+DEFAULT_CACHE_PATH = Path(os.environ.get("TALENTFIT_CACHE", Path.home() / ".cache" / "talentfit" / "text.sqlite"))
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+def file_bytes(file):
+    """Return the raw bytes of a path, an uploaded file (Streamlit UploadedFile) or a binary stream."""
+    if isinstance(file, (bytes, bytearray)):
+        return bytes(file)
+    if isinstance(file, (str, os.PathLike)):
+        return Path(file).read_bytes()
+    if hasattr(file, "getvalue"):
+        return file.getvalue()
+    if hasattr(file, "seek"):
+        file.seek(0)
+    return file.read()
+
+
+class TextCache:
+    """Persistent SQLite store of extracted PDF text keyed by the SHA-256 of the PDF bytes.
+
+    The total size of stored text is bounded by ``max_bytes``; when a write goes over the
+    limit the least recently used entries are evicted. Safe to share between threads and
+    between processes pointing at the same file.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = str(path)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS texts ("
+            " key TEXT PRIMARY KEY, text TEXT NOT NULL, size INTEGER NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS texts_last_used ON texts (last_used)")
+
+    def get(self, key):
+        with self._lock:
+            row = self._conn.execute("SELECT text FROM texts WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._conn.execute("UPDATE texts SET last_used = ? WHERE key = ?", (time.time(), key))
+            return row[0]
+
+    def put(self, key, text):
+        size = len(text.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO texts (key, text, size, last_used) VALUES (?, ?, ?, ?)",
+                    (key, text, size, time.time()),
+                )
+                self._evict()
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM texts").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute("SELECT key, size FROM texts ORDER BY last_used ASC").fetchall()
+        stale = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            stale.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM texts WHERE key = ?", stale)
+
+    def total_bytes(self):
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM texts").fetchone()[0]
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM texts").fetchone()[0]
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM texts")
+
+    def close(self):
+        self._conn.close()
+
+
+def open_cache(path):
+    """TextCache at ``path``, or None (with a warning) when it cannot be opened there.
+
+    A read-only or missing cache location must not fail the documents; they are just not cached.
+    """
+    if not path:
+        return None
+    try:
+        return TextCache(path)
+    except (OSError, sqlite3.Error) as exc:
+        warnings.warn(f"text cache disabled, cannot open {path}: {exc}", RuntimeWarning, stacklevel=2)
+        return None
+
+def read_pdf_cached(file, cache, extract=read_pdf, variant=""):
+    """Run ``extract`` (read_pdf by default) unless ``cache`` already holds text for these exact bytes.
+
+    ``variant`` separates entries produced by extractors with different output for the same bytes.
+    """
+    with timing.stage("upload_read") as span:
+        data = file_bytes(file)
+        span.bytes = len(data)
+    key = content_hash(data) + (f":{variant}" if variant else "")
+    with timing.stage("text_cache"):
+        text = cache.get(key)
+    timing.count("cache_miss" if text is None else "cache_hit")
+    if text is None:
+        text = extract(io.BytesIO(data))
+        cache.put(key, text)
+    return text
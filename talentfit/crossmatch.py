@@ -0,0 +1,190 @@
+"""Full CV x job similarity in memory-bounded row blocks.
+
+    python -m talentfit.crossmatch CVS... --jobs jobs.csv -o scores.csv [--top-k 20]
+
+CVs are read and scored ``--block-rows`` at a time, so memory stays proportional to one
+block (and to the output when ``--top-k`` is given), whatever the number of CVs. PDFs that
+cannot be read, or that hang or crash their worker (see talentfit.isolation), are left out of
+the scores and listed in ``<output>.errors.csv``.
+"""
+import argparse
+import csv
+import itertools
+import json
+import os
+import sys
+import time
+from collections import deque
+from pathlib import Path
+
+import numpy as np
+
+from . import isolation
+from .batch import find_pdfs
+from .cache import DEFAULT_CACHE_PATH, open_cache, read_pdf_cached
+from .jobs import JobIndex, load_jobs
+from .scoring import read_pdf
+
+DEFAULT_BLOCK_ROWS = 2048
+
+
+# -----------------------------
+# Blocked scoring
+# -----------------------------
+def chunked(iterable, size):
+    it = iter(iterable)
+    while block := list(itertools.islice(it, size)):
+        yield block
+
+def top_k_rows(scores, k):
+    """Column indices of the ``k`` best scores in every row, best first (ties by column)."""
+    k = min(k, scores.shape[1])
+    idx = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    top = np.take_along_axis(scores, idx, axis=1)
+    order = np.lexsort((idx, -top), axis=1)
+    return np.take_along_axis(idx, order, axis=1)
+
+def cross_match(index, cvs, block_rows=DEFAULT_BLOCK_ROWS, top_k=None):
+    """Yield ``(cv_ids, block)`` for ``cvs`` given as ``(cv_id, text)`` pairs.
+
+    ``block`` is a dense ``(rows, jobs)`` array of similarities (0-100), or with ``top_k`` a
+    ``(job_indices, scores)`` pair of ``(rows, k)`` arrays.
+    """
+    job_matrix_t = index.matrix.T.tocsc()
+    for block in chunked(cvs, block_rows):
+        cv_ids = [cv_id for cv_id, _ in block]
+        sims = (index.transform([text for _, text in block]) @ job_matrix_t).toarray() * 100
+        if top_k:
+            idx = top_k_rows(sims, top_k)
+            yield cv_ids, (idx, np.take_along_axis(sims, idx, axis=1))
+        else:
+            yield cv_ids, sims
+
+
+# -----------------------------
+# CV sources
+# -----------------------------
+_cache = None
+
+def _init_worker(cache_path):
+    global _cache
+    _cache = open_cache(cache_path)
+
+def _extract(path):
+    """``(cv_id, text, error)``; one unreadable CV must not stop the run."""
+    try:
+        if _cache is not None:
+            return str(path), read_pdf_cached(path, _cache), ""
+        with open(path, "rb") as fh:
+            return str(path), read_pdf(fh), ""
+    except Exception as exc:
+        return str(path), "", f"{type(exc).__name__}: {exc}"
+
+def iter_cv_texts(inputs, workers=None, cache_path=None, errors=None, limits=isolation.DEFAULT_LIMITS):
+    """Yield ``(cv_id, text)`` from a JSONL/CSV of ``id``/``text`` rows or from PDFs.
+
+    PDFs are extracted on an IsolatedPool with ``limits`` (``(timeout, memory_limit_mb, max_tasks,
+    max_rss_mb)``). Those that cannot be read or time out are skipped, not scored as empty text;
+    their ``(cv_id, error)`` go to the ``errors`` list when one is given.
+    """
+    if len(inputs) == 1 and Path(inputs[0]).suffix.lower() in (".jsonl", ".ndjson"):
+        with open(inputs[0], encoding="utf-8") as fh:
+            for line in fh:
+                if line.strip():
+                    row = json.loads(line)
+                    yield str(row["id"]), row["text"]
+        return
+    if len(inputs) == 1 and Path(inputs[0]).suffix.lower() == ".csv":
+        with open(inputs[0], newline="", encoding="utf-8") as fh:
+            for row in csv.DictReader(fh):
+                yield row["id"], row["text"]
+        return
+
+    paths = find_pdfs(inputs)
+    workers = workers or os.cpu_count() or 1
+    pool = isolation.IsolatedPool(workers, _init_worker, (cache_path,), *limits)
+    # A bounded window of PDFs in flight keeps memory flat however many CVs there are
+    window, in_flight = workers * 16, deque()
+    try:
+        for path in itertools.chain(paths, [None] * window):
+            if path is not None:
+                in_flight.append((path, pool.submit(_extract, path)))
+            if len(in_flight) < window and path is not None:
+                continue
+            if not in_flight:
+                break
+            path, future = in_flight.popleft()
+            try:
+                cv_id, text, error = future.result()
+            except Exception as exc:  # DocumentTimeout, WorkerCrashed, WorkerStartFailed
+                cv_id, text, error = str(path), "", f"{type(exc).__name__}: {exc}"
+            if not error:
+                yield cv_id, text
+            elif errors is not None:
+                errors.append((cv_id, error))
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+# -----------------------------
+# Output
+# -----------------------------
+def write_results(out, job_ids, blocks, top_k=None):
+    """Stream blocks to CSV: wide (one column per job) or, with ``top_k``, long (cv, rank, job, score)."""
+    writer = csv.writer(out)
+    if top_k:
+        writer.writerow(["CV", "Rank", "Job", "Match %"])
+    else:
+        writer.writerow(["CV", *job_ids])
+    rows = 0
+    for cv_ids, block in blocks:
+        if top_k:
+            idx, scores = block
+            for cv_id, row_idx, row_scores in zip(cv_ids, idx, scores):
+                writer.writerows(
+                    [cv_id, rank, job_ids[j], round(float(s), 2)]
+                    for rank, (j, s) in enumerate(zip(row_idx, row_scores), start=1)
+                )
+        else:
+            for cv_id, row in zip(cv_ids, np.round(block, 2)):
+                writer.writerow([cv_id, *row.tolist()])
+        rows += len(cv_ids)
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("inputs", nargs="+", help="PDF files/directories/globs, or one JSONL/CSV of id,text")
+    parser.add_argument("--jobs", required=True, help="directory of .txt files, CSV or JSONL (id, description)")
+    parser.add_argument("-o", "--output", default="cv_job_scores.csv")
+    parser.add_argument("-k", "--top-k", type=int, default=None, help="keep only the k best jobs per CV")
+    parser.add_argument("--block-rows", type=int, default=DEFAULT_BLOCK_ROWS, help="CVs scored per block")
+    parser.add_argument("-j", "--workers", type=int, default=None)
+    parser.add_argument("--cache", default=str(DEFAULT_CACHE_PATH), help="SQLite cache of extracted text")
+    parser.add_argument("--no-cache", action="store_true")
+    isolation.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    index = JobIndex(load_jobs(args.jobs))
+    start = time.perf_counter()
+    errors = []
+    cvs = iter_cv_texts(args.inputs, args.workers, None if args.no_cache else args.cache, errors,
+                        isolation.limits(args))
+    with open(args.output, "w", newline="", encoding="utf-8") as out:
+        rows = write_results(out, index.job_ids, cross_match(index, cvs, args.block_rows, args.top_k), args.top_k)
+    elapsed = time.perf_counter() - start
+    rate = rows / elapsed if elapsed > 0 else 0.0
+    print(f"Scored {rows} CVs x {len(index)} jobs in {elapsed:.2f}s - {rate:.1f} CVs/sec -> {args.output}",
+          file=sys.stderr)
+    if errors:
+        errors_path = Path(args.output).with_suffix(".errors.csv")
+        with open(errors_path, "w", newline="", encoding="utf-8") as out:
+            writer = csv.writer(out)
+            writer.writerow(["CV", "Error"])
+            writer.writerows(errors)
+        print(f"{len(errors)} CVs could not be read and were not scored -> {errors_path}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
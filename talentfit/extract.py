@@ -0,0 +1,88 @@
+"""Page-parallel extraction of one PDF across worker processes.
+
+Not on any scoring path: the app, service and batch CLI parallelise across CVs instead (one CV
+per worker, see talentfit.background and talentfit.isolation), where splitting a CV's pages
+over more processes would only nest pools. Kept for ``benchmarks.bench_parallel_extract``,
+which measures what page-level parallelism would buy for very long single documents.
+"""
+import atexit
+import io
+import itertools
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from .backends import get_backend
+from .cache import file_bytes
+
+# Below this many pages the pool round-trip costs more than it saves
+MIN_PARALLEL_PAGES = 8
+
+_pool = None
+_pool_workers = 0
+
+
+def get_pool(workers=None):
+    """Process pool shared by all parallel extractions in this process, created on first use."""
+    global _pool, _pool_workers
+    workers = workers or os.cpu_count() or 1
+    if _pool is None or _pool_workers != workers:
+        shutdown_pool()
+        # spawn: forking a multi-threaded server (Streamlit) is not safe
+        _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        _pool_workers = workers
+    return _pool
+
+def shutdown_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
+
+atexit.register(shutdown_pool)
+
+
+def extract_page_range(data, start, stop, backend=None):
+    """Worker task: text of pages ``start:stop``, with the same separators as read_pdf."""
+    backend = get_backend(backend)
+    return _extract_range(backend, backend.open(io.BytesIO(data)), start, stop)
+
+def _extract_range(backend, document, start, stop):
+    parts = []
+    for page in itertools.islice(backend.pages(document, stop), start, None):
+        page_text = backend.page_text(page)
+        if page_text:
+            parts.append(page_text + " ")
+    return "".join(parts)
+
+def split_pages(n_pages, n_chunks):
+    n_chunks = max(1, min(n_chunks, n_pages))
+    size, extra = divmod(n_pages, n_chunks)
+    bounds, start = [], 0
+    for i in range(n_chunks):
+        stop = start + size + (1 if i < extra else 0)
+        bounds.append((start, stop))
+        start = stop
+    return bounds
+
+def read_pdf_parallel(file, workers=None, min_pages=MIN_PARALLEL_PAGES, executor=None, max_pages=None,
+                      backend=None):
+    """read_pdf(file, backend) with pages split across worker processes; output is identical.
+
+    ``max_pages`` limits extraction to the first pages of the document.
+    """
+    data = file_bytes(file)
+    extractor = get_backend(backend)
+    document = extractor.open(io.BytesIO(data))
+    n_pages = extractor.page_count(document)
+    if max_pages is not None:
+        n_pages = min(n_pages, max_pages)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or n_pages < min_pages:
+        return _extract_range(extractor, document, 0, n_pages)
+
+    executor = executor or get_pool(workers)
+    # A few chunks per worker keeps the load balanced when some pages are much denser
+    bounds = split_pages(n_pages, workers * 2)
+    futures = [executor.submit(extract_page_range, data, start, stop, backend) for start, stop in bounds]
+    return "".join(f.result() for f in futures)
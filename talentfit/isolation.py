@@ -0,0 +1,270 @@
+"""Killable worker processes for PDF extraction.
+
+``ProcessPoolExecutor`` cannot stop a task once it has started, so one PDF that hangs in
+``page.extract_text()`` blocks its worker (and whoever waits for it) for good. IsolatedPool is an
+Executor whose every worker runs one task at a time under a watchdog:
+
+* a task that runs past ``timeout`` seconds has its worker killed and fails with
+  DocumentTimeout; a worker that dies mid-task (segfault, OOM kill) fails it with WorkerCrashed.
+  Either way a fresh worker takes the slot and the other tasks carry on;
+* a worker that cannot start (its initializer raised) breaks the pool: that task and every later
+  one fail with WorkerStartFailed carrying the initializer's error, and no more workers are forked;
+* ``memory_limit_mb`` caps each worker's address space (RLIMIT_AS), so a decompression bomb
+  fails with MemoryError inside the worker instead of taking the machine down;
+* workers are recycled after ``max_tasks`` tasks, or after any task that leaves them above
+  ``max_rss_mb`` resident, so slow growth in long-running workers is shed.
+
+    with IsolatedPool(workers=4, initializer=batch._init_worker, initargs=(profile,), timeout=60) as pool:
+        futures = [pool.submit(batch._score_path, p) for p in paths]
+"""
+import multiprocessing
+import queue
+import threading
+from concurrent.futures import Executor, Future
+
+from . import timing
+
+DEFAULT_TIMEOUT = 60.0
+DEFAULT_MEMORY_LIMIT_MB = 4096
+DEFAULT_MAX_TASKS = 500
+DEFAULT_MAX_RSS_MB = 1024
+DEFAULT_LIMITS = (DEFAULT_TIMEOUT, DEFAULT_MEMORY_LIMIT_MB, DEFAULT_MAX_TASKS, DEFAULT_MAX_RSS_MB)
+
+
+class DocumentTimeout(TimeoutError):
+    """The task ran past the pool's timeout; its worker was killed."""
+
+
+class WorkerCrashed(RuntimeError):
+    """The worker process died while running the task."""
+
+
+class WorkerStartFailed(RuntimeError):
+    """A worker could not start, so the pool is broken and runs no more tasks."""
+
+
+# -----------------------------
+# Worker side
+# -----------------------------
+def _limit_address_space(limit_mb):
+    try:
+        import resource
+    except ImportError:  # no resource module on Windows
+        return
+    limit = int(limit_mb * 1024 * 1024)
+    soft, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+def _worker_main(conn, initializer, initargs, memory_limit_mb):
+    try:
+        if initializer is not None:
+            initializer(*initargs)
+        if memory_limit_mb:
+            _limit_address_space(memory_limit_mb)  # after the imports, which are not the documents' fault
+    except BaseException as exc:
+        conn.send(f"{type(exc).__name__}: {exc}")  # the parent reports it; a traceback on stderr helps no one
+        return
+    conn.send(None)
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+        fn, args, kwargs = task
+        try:
+            outcome = (True, fn(*args, **kwargs))
+        except BaseException as exc:  # MemoryError from the address-space cap included
+            outcome = (False, exc)
+        try:
+            conn.send((outcome, timing.rss_bytes()))
+        except Exception as exc:  # unpicklable result or exception
+            conn.send(((False, RuntimeError(f"{type(exc).__name__}: {exc}")), timing.rss_bytes()))
+
+
+# -----------------------------
+# Parent side
+# -----------------------------
+class _Worker:
+    def __init__(self, ctx, initializer, initargs, memory_limit_mb):
+        self.conn, child = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child, initializer, initargs, memory_limit_mb),
+                                   daemon=True)
+        self.process.start()
+        child.close()
+        self.tasks = 0
+        try:
+            error = self.conn.recv()  # None once the initializer is done
+        except EOFError:
+            self.kill()
+            raise WorkerStartFailed(f"worker failed to start (exit code {self.process.exitcode})")
+        if error is not None:
+            self.kill()
+            raise WorkerStartFailed(f"worker failed to start: {error}")
+
+    def run(self, fn, args, kwargs, timeout):
+        """``(ok, result or exception, rss bytes)``; raises DocumentTimeout / WorkerCrashed."""
+        self.tasks += 1
+        self.conn.send((fn, args, kwargs))
+        try:
+            ready = self.conn.poll(timeout)
+            if ready:
+                (ok, value), rss = self.conn.recv()
+        except (EOFError, OSError):
+            self.kill()
+            raise WorkerCrashed(f"worker died (exit code {self.process.exitcode})")
+        if not ready:
+            self.kill()
+            raise DocumentTimeout(f"no result after {timeout:g} s; worker killed")
+        return ok, value, rss
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(5)
+        self.kill()
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class IsolatedPool(Executor):
+    """Executor running each task in a killable worker process; see the module docstring.
+
+    ``timeout``, ``memory_limit_mb``, ``max_tasks`` and ``max_rss_mb`` may each be None (no limit).
+    Workers start on their first task. The default context is forkserver where available: its
+    workers fork from a clean server process that has already imported the initializer's module,
+    so replacing a worker is cheap and the parent's threads are never forked.
+    """
+
+    def __init__(self, workers=1, initializer=None, initargs=(), timeout=DEFAULT_TIMEOUT,
+                 memory_limit_mb=DEFAULT_MEMORY_LIMIT_MB, max_tasks=DEFAULT_MAX_TASKS,
+                 max_rss_mb=DEFAULT_MAX_RSS_MB, mp_context=None):
+        if mp_context is None:
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            mp_context = multiprocessing.get_context(method)
+            if method == "forkserver" and initializer is not None:
+                mp_context.set_forkserver_preload([initializer.__module__])
+        self.workers = workers
+        self.timeout = timeout
+        self.max_tasks = max_tasks
+        self.max_rss_mb = max_rss_mb
+        self._ctx = mp_context
+        self._worker_args = (initializer, initargs, memory_limit_mb)
+        self._tasks = queue.SimpleQueue()
+        self._counts = {"started": 0, "recycled": 0, "timeouts": 0, "crashes": 0}
+        self._lock = threading.Lock()
+        self._shutdown = False
+        self._broken = None  # the WorkerStartFailed that broke the pool
+        self._threads = [threading.Thread(target=self._slot, name=f"talentfit-isolated-{i}", daemon=True)
+                         for i in range(workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, fn, /, *args, **kwargs):
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("cannot submit after shutdown")
+            future = Future()
+            self._tasks.put((future, fn, args, kwargs))
+        return future
+
+    def shutdown(self, wait=True, *, cancel_futures=False):
+        with self._lock:
+            self._shutdown = True
+            if cancel_futures:
+                while True:
+                    try:
+                        item = self._tasks.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is not None:
+                        item[0].cancel()
+            for _ in self._threads:
+                self._tasks.put(None)
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def stats(self):
+        """Worker counts, and under ``broken`` why no worker could start (None while the pool works)."""
+        with self._lock:
+            return {**self._counts, "broken": str(self._broken) if self._broken else None}
+
+    def _count(self, name):
+        with self._lock:
+            self._counts[name] += 1
+
+    def _slot(self):
+        """One worker slot: runs queued tasks one at a time, replacing its worker as needed."""
+        worker = None
+        while True:
+            item = self._tasks.get()
+            if item is None:
+                break
+            future, fn, args, kwargs = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            if self._broken is not None:
+                future.set_exception(self._broken)
+                continue
+            try:
+                if worker is None:
+                    worker = _Worker(self._ctx, *self._worker_args)
+                    self._count("started")
+                ok, value, rss = worker.run(fn, args, kwargs, self.timeout)
+            except WorkerStartFailed as exc:
+                with self._lock:
+                    self._broken = self._broken or exc
+                future.set_exception(self._broken)
+                continue
+            except (DocumentTimeout, WorkerCrashed) as exc:
+                self._count("timeouts" if isinstance(exc, DocumentTimeout) else "crashes")
+                worker = None
+                future.set_exception(exc)
+                continue
+            except BaseException as exc:  # e.g. an unpicklable task
+                if worker is not None:
+                    worker.kill()
+                worker = None
+                future.set_exception(exc)
+                continue
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+            if (self.max_tasks and worker.tasks >= self.max_tasks) or \
+                    (self.max_rss_mb and rss > self.max_rss_mb * 1024 * 1024):
+                worker.stop()
+                worker = None
+                self._count("recycled")
+        if worker is not None:
+            worker.stop()
+
+
+# -----------------------------
+# CLI flags
+# -----------------------------
+def add_arguments(parser):
+    """The pool limits as CLI flags; ``limits(args)`` turns them into IsolatedPool arguments."""
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT,
+                        help="seconds a CV may take before its worker is killed and the CV reported as timed out")
+    parser.add_argument("--memory-limit-mb", type=int, default=DEFAULT_MEMORY_LIMIT_MB,
+                        help="address-space limit of each worker process")
+    parser.add_argument("--max-tasks-per-worker", type=int, default=DEFAULT_MAX_TASKS,
+                        help="replace a worker after this many tasks")
+    parser.add_argument("--max-rss-mb", type=int, default=DEFAULT_MAX_RSS_MB,
+                        help="replace a worker once its resident memory exceeds this")
+
+def limits(args):
+    """``(timeout, memory_limit_mb, max_tasks, max_rss_mb)`` from add_arguments' flags; 0 turns one off."""
+    return (args.timeout or None, args.memory_limit_mb or None, args.max_tasks_per_worker or None,
+            args.max_rss_mb or None)
@@ -0,0 +1,118 @@
+import argparse
+import csv
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from . import isolation
+from .scoring import clean_text, read_pdf
+
+TEXT_SUFFIXES = (".txt", ".md")
+
+
+# -----------------------------
+# Job description sources
+# -----------------------------
+def load_jobs(path):
+    """Read job descriptions as ``[(job_id, text), ...]``.
+
+    Accepts a directory of .txt/.md files (id = file stem), a CSV with ``id`` and
+    ``description`` columns, or a JSONL file with the same keys.
+    """
+    path = Path(path)
+    if path.is_dir():
+        return [(p.stem, p.read_text(encoding="utf-8")) for p in sorted(path.iterdir())
+                if p.suffix.lower() in TEXT_SUFFIXES]
+    if path.suffix.lower() == ".csv":
+        with open(path, newline="", encoding="utf-8") as fh:
+            return [(row["id"], row["description"]) for row in csv.DictReader(fh)]
+    if path.suffix.lower() in (".jsonl", ".ndjson"):
+        with open(path, encoding="utf-8") as fh:
+            rows = [json.loads(line) for line in fh if line.strip()]
+        return [(str(r["id"]), r["description"]) for r in rows]
+    raise ValueError(f"Unsupported job source: {path}")
+
+
+# -----------------------------
+# Index
+# -----------------------------
+class JobIndex:
+    """Sparse TF-IDF matrix of many job descriptions, scored against a CV in one product.
+
+    Rows are L2-normalised at fit time, so ``matrix @ cv_vector`` is the TF-IDF cosine of the
+    CV to every job at once. The IDF is fitted on the whole job corpus, so a score is not the
+    one calculate_similarity gives for the same pair (that refits IDF on the two documents):
+    terms common to many jobs count less here. Rankings are comparable within one index only.
+    """
+
+    def __init__(self, jobs):
+        jobs = list(jobs)
+        if not jobs:
+            raise ValueError("JobIndex needs at least one job description")
+        self.job_ids = [job_id for job_id, _ in jobs]
+        self.vectorizer = TfidfVectorizer(stop_words="english")
+        self.matrix = self.vectorizer.fit_transform([clean_text(text) for _, text in jobs]).tocsr()
+
+    def __len__(self):
+        return len(self.job_ids)
+
+    def transform(self, cv_texts):
+        return self.vectorizer.transform([clean_text(t) for t in cv_texts])
+
+    def scores(self, cv_text):
+        """Similarity (0-100) of ``cv_text`` to every job, in index order."""
+        cv_vec = self.transform([cv_text])
+        return np.asarray((self.matrix @ cv_vec.T).todense()).ravel() * 100
+
+    def top_k(self, cv_text, k=10):
+        """``[(job_id, score), ...]`` for the ``k`` best matching jobs, best first."""
+        return top_k_indices(self.scores(cv_text), k, self.job_ids)
+
+
+def top_k_indices(scores, k, labels):
+    k = min(k, len(scores))
+    if k <= 0:
+        return []
+    idx = np.argpartition(-scores, k - 1)[:k]
+    idx = idx[np.lexsort((idx, -scores[idx]))]
+    return [(labels[i], round(float(scores[i]), 2)) for i in idx]
+
+
+# -----------------------------
+# CLI
+# -----------------------------
+def _read_pdf_path(path):
+    with open(path, "rb") as fh:
+        return read_pdf(fh)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rank open job descriptions for one CV.")
+    parser.add_argument("cv", help="CV as PDF or plain text")
+    parser.add_argument("--jobs", required=True, help="directory of .txt files, CSV or JSONL (id, description)")
+    parser.add_argument("-k", "--top", type=int, default=10)
+    isolation.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    index = JobIndex(load_jobs(args.jobs))
+    cv_path = Path(args.cv)
+    if cv_path.suffix.lower() == ".pdf":
+        # In a killable worker, like the batch CLI: a PDF that hangs or blows up memory fails cleanly
+        with isolation.IsolatedPool(1, None, (), *isolation.limits(args)) as pool:
+            try:
+                cv_text = pool.submit(_read_pdf_path, str(cv_path)).result()
+            except Exception as exc:
+                print(f"Could not read {cv_path}: {type(exc).__name__}: {exc}", file=sys.stderr)
+                return 1
+    else:
+        cv_text = cv_path.read_text(encoding="utf-8")
+
+    for rank, (job_id, score) in enumerate(index.top_k(cv_text, args.top), start=1):
+        print(f"{rank:>3}  {score:6.2f}%  {job_id}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+from collections import Counter, deque
+
+from . import timing
+
+try:  # optional C implementation, same results as the pure-Python automaton below
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over the lowercased keywords of a skills taxonomy.
+
+    A single pass over the lowercased text reports every (possibly overlapping) keyword
+    occurrence, which is exactly the ``k.lower() in text.lower()`` test applied to all
+    keywords at once. Matching cost depends on the text length, not on the number of keywords.
+    """
+
+    def __init__(self, keywords, native=None):
+        self.patterns = list(dict.fromkeys(k.lower() for k in keywords if k))
+        self.pattern_ids = {p: i for i, p in enumerate(self.patterns)}
+        self.native = ahocorasick is not None if native is None else native
+        if self.native and ahocorasick is None:
+            raise ImportError("pyahocorasick is not installed")
+        if self.native:
+            self._automaton = ahocorasick.Automaton()
+            for i, p in enumerate(self.patterns):
+                self._automaton.add_word(p, (i, len(p)))
+            if self.patterns:
+                self._automaton.make_automaton()
+        else:
+            self._build()
+
+    @classmethod
+    def from_skills(cls, skills, native=None):
+        return cls([k for keywords in skills.values() for k in keywords], native=native)
+
+    def id_of(self, keyword):
+        return self.pattern_ids[keyword.lower()]
+
+    # -----------------------------
+    # Automaton construction
+    # -----------------------------
+    def _build(self):
+        goto = [{}]
+        out = [()]
+        for i, p in enumerate(self.patterns):
+            state = 0
+            for ch in p:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    out.append(())
+                state = nxt
+            out[state] = out[state] + (i,)
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                out[nxt] = out[nxt] + out[fail[nxt]]
+
+        self._goto = goto
+        self._fail = fail
+        self._out = out
+
+    # -----------------------------
+    # Matching
+    # -----------------------------
+    def iter_matches(self, text, lowered=False):
+        """Yield ``(start, pattern_id)`` for every keyword occurrence; offsets refer to the lowercased text."""
+        if not self.patterns or not text:
+            return
+        if not lowered:
+            text = text.lower()
+        if self.native:
+            for end, (i, length) in self._automaton.iter(text):
+                yield end - length + 1, i
+            return
+
+        goto, fail, out, lengths = self._goto, self._fail, self._out, [len(p) for p in self.patterns]
+        state = 0
+        for pos, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                for i in out[state]:
+                    yield pos - lengths[i] + 1, i
+
+    def find_all(self, text, lowered=False):
+        """Return ``[(start, end, keyword), ...]`` ordered by end offset."""
+        return [(s, s + len(self.patterns[i]), self.patterns[i]) for s, i in self.iter_matches(text, lowered)]
+
+    def counts(self, text, lowered=False):
+        """Return ``{keyword: occurrences}`` for every keyword found in ``text``."""
+        return Counter(self.patterns[i] for _, i in self.iter_matches(text, lowered))
+
+    def hit_ids(self, text, lowered=False):
+        with timing.stage("keyword_matching", chars=len(text)):
+            return {i for _, i in self.iter_matches(text, lowered)}
+
+    def hit_ids_stream(self, chunks, sep=" "):
+        """hit_ids of ``sep.join(chunks)``, consuming the chunks one at a time.
+
+        The last ``longest keyword - 1`` characters of each chunk are carried over so keywords
+        spanning a chunk boundary are still found.
+        """
+        keep = max((len(p) for p in self.patterns), default=1) - 1
+        hit_ids = set()
+        tail = None
+        for chunk in chunks:
+            text = chunk.lower() if tail is None else tail + sep + chunk.lower()
+            hit_ids |= self.hit_ids(text, lowered=True)
+            tail = text[-keep:] if keep else ""
+        return hit_ids
+
+    def hits(self, text, lowered=False):
+        return {self.patterns[i] for i in self.hit_ids(text, lowered)}
@@ -0,0 +1,155 @@
+"""Process-wide scoring metrics in the Prometheus text exposition format.
+
+The scoring front ends (``service``'s ``GET /metrics`` and the app's ``ScoringQueue``) call
+``observe_document`` with each finished results row; the per-stage timings a worker attaches
+to the row (see talentfit.timing) feed the histograms, so workers need no metrics state of
+their own. ``serve(port)`` exposes the registry on a background HTTP thread for processes
+without their own server, e.g. the Streamlit app::
+
+    TALENTFIT_METRICS_PORT=9108 streamlit run app.py
+    curl -s localhost:9108/metrics
+"""
+import bisect
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+SCORING_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1)
+PAGE_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100, 300)
+CHAR_BUCKETS = (1000, 2500, 5000, 10000, 25000, 50000, 100000, 250000, 1000000)
+
+
+def _format(value):
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Counter:
+    def __init__(self, name, help):
+        self.name = name
+        self.help = help
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+    def expose(self):
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter", f"{self.name} {_format(self.value)}"]
+
+
+class Histogram:
+    def __init__(self, name, help, buckets):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot: above the largest bound
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += value
+
+    def expose(self):
+        with self._lock:
+            counts, total = list(self.counts), self.sum
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        cumulative = 0
+        for bound, n in zip(self.buckets, counts):
+            cumulative += n
+            lines.append(f'{self.name}_bucket{{le="{_format(bound)}"}} {cumulative}')
+        cumulative += counts[-1]
+        lines.append(f'{self.name}_bucket{{le="+Inf"}} {cumulative}')
+        lines.append(f"{self.name}_sum {_format(total)}")
+        lines.append(f"{self.name}_count {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+
+    def counter(self, name, help):
+        self.metrics.append(Counter(name, help))
+        return self.metrics[-1]
+
+    def histogram(self, name, help, buckets):
+        self.metrics.append(Histogram(name, help, buckets))
+        return self.metrics[-1]
+
+    def expose(self):
+        return "\n".join(line for metric in self.metrics for line in metric.expose()) + "\n"
+
+
+REGISTRY = Registry()
+CVS_SCORED = REGISTRY.counter("talentfit_cvs_scored_total", "CVs scored, including failed ones.")
+EXTRACTION_FAILURES = REGISTRY.counter("talentfit_extraction_failures_total", "PDFs that could not be read or scored.")
+CACHE_HITS = REGISTRY.counter("talentfit_text_cache_hits_total", "Extracted-text cache hits.")
+CACHE_MISSES = REGISTRY.counter("talentfit_text_cache_misses_total", "Extracted-text cache misses.")
+EXTRACTION_SECONDS = REGISTRY.histogram(
+    "talentfit_extraction_seconds", "Time to open a PDF and extract its pages.", SECONDS_BUCKETS)
+PAGES = REGISTRY.histogram("talentfit_document_pages", "Pages extracted per PDF.", PAGE_BUCKETS)
+CHARS = REGISTRY.histogram("talentfit_document_chars", "Characters of CV text scored per document.", CHAR_BUCKETS)
+SCORING_SECONDS = REGISTRY.histogram(
+    "talentfit_scoring_seconds", "Keyword matching and similarity time per CV.", SCORING_BUCKETS)
+END_TO_END_SECONDS = REGISTRY.histogram(
+    "talentfit_end_to_end_seconds", "From receiving a CV to its finished results row.", SECONDS_BUCKETS)
+
+
+def _ms(stages, *names):
+    return sum(stages[name]["ms"] for name in names if name in stages)
+
+def observe_document(row, source="pdf", batch_size=1):
+    """Record one finished results row.
+
+    ``batch_size`` > 1 means the row's timings cover a micro-batch of that many texts; its
+    scoring time and chars are then shared out evenly.
+    """
+    stages = row.get("Timings") or {}
+    CVS_SCORED.inc()
+    failed = bool(row.get("Error"))
+    if source == "pdf" and failed:
+        EXTRACTION_FAILURES.inc()
+    if "cache_hit" in stages:
+        CACHE_HITS.inc(stages["cache_hit"]["calls"])
+    if "cache_miss" in stages:
+        CACHE_MISSES.inc(stages["cache_miss"]["calls"])
+    if "pdf_open" in stages and not failed:  # a failed read would log as a fast, short document
+        EXTRACTION_SECONDS.observe(_ms(stages, "pdf_open", "read_pdf_page") / 1000)
+        PAGES.observe(stages.get("read_pdf_page", {}).get("calls", 0))
+    if "keyword_matching" in stages:
+        CHARS.observe(stages["keyword_matching"]["chars"] / batch_size)
+        SCORING_SECONDS.observe(_ms(stages, "keyword_matching", "similarity") / 1000 / batch_size)
+
+
+# -----------------------------
+# Stand-alone exposition
+# -----------------------------
+class _Handler(BaseHTTPRequestHandler):
+    registry = REGISTRY
+
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        data = self.registry.expose().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+def serve(port, host="127.0.0.1", registry=REGISTRY):
+    """Serve ``GET /metrics`` on a daemon thread; returns the server (``server.shutdown()`` stops it)."""
+    handler = type("MetricsHandler", (_Handler,), {"registry": registry})
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, name="talentfit-metrics", daemon=True).start()
+    return server
@@ -0,0 +1,123 @@
+import hashlib
+import json
+import os
+import pickle
+from pathlib import Path
+
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer
+
+from .data import JOB_DESC, SKILLS
+from .matcher import KeywordMatcher
+from .scoring import clean_text
+
+# Bump whenever the stored fields or their meaning change; older artifacts are then rebuilt
+SCHEMA_VERSION = 1
+DEFAULT_PROFILE_PATH = Path(
+    os.environ.get("TALENTFIT_PROFILE", Path.home() / ".cache" / "talentfit" / "jd_profile.pkl")
+)
+
+
+def text_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def taxonomy_hash(skills):
+    return text_hash(json.dumps(skills, ensure_ascii=False))
+
+def keyword_vectorizer(vocabulary=None):
+    """Same analyzer as calculate_similarity's TfidfVectorizer, counting raw term frequencies."""
+    return CountVectorizer(stop_words="english", vocabulary=vocabulary)
+
+
+class ProfileMismatch(ValueError):
+    """A stored profile was built for another schema, job description or taxonomy."""
+
+
+class JobProfile:
+    """Everything about a job description the per-CV path needs, computed once.
+
+    Holds the cleaned and lowercased JD text, the keywords of each skill found in it, the
+    keyword vocabulary and the per-skill JD count vectors. Save it with ``save`` and load it
+    at startup with ``load_or_build``.
+    """
+
+    def __init__(self, skills, job_desc_clean, jd_hits, vocabulary, jd_counts, job_desc_hash):
+        self.skills = skills
+        self.job_desc_clean = job_desc_clean
+        self.job_desc_lower = job_desc_clean.lower()
+        self.jd_hits = jd_hits
+        self.jd_parts = [" ".join(jd_hits[skill]) for skill in skills]
+        self.vocabulary = vocabulary
+        self.jd_counts = jd_counts
+        self.job_desc_hash = job_desc_hash
+        self.taxonomy_hash = taxonomy_hash(skills)
+
+    @classmethod
+    def build(cls, job_desc=JOB_DESC, skills=SKILLS):
+        job_desc_clean = clean_text(job_desc)
+        matcher = KeywordMatcher.from_skills(skills)
+        hit_ids = matcher.hit_ids(job_desc_clean)
+        jd_hits = {
+            skill: [k for k in keywords if k and matcher.id_of(k) in hit_ids]
+            for skill, keywords in skills.items()
+        }
+        vectorizer = keyword_vectorizer()
+        vectorizer.fit([" ".join(k for keywords in skills.values() for k in keywords)])
+        jd_counts = vectorizer.transform([" ".join(jd_hits[s]) for s in skills]).toarray().astype(np.float64)
+        return cls(skills, job_desc_clean, jd_hits, dict(vectorizer.vocabulary_), jd_counts, text_hash(job_desc))
+
+    def matches(self, job_desc=JOB_DESC, skills=SKILLS):
+        return self.job_desc_hash == text_hash(job_desc) and self.taxonomy_hash == taxonomy_hash(skills)
+
+    # -----------------------------
+    # Serialization
+    # -----------------------------
+    def to_dict(self):
+        return {
+            "schema_version": SCHEMA_VERSION,
+            "skills": self.skills,
+            "job_desc_clean": self.job_desc_clean,
+            "job_desc_hash": self.job_desc_hash,
+            "jd_hits": self.jd_hits,
+            "vocabulary": self.vocabulary,
+            "jd_counts": self.jd_counts.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, d):
+        if d.get("schema_version") != SCHEMA_VERSION:
+            raise ProfileMismatch(f"profile schema {d.get('schema_version')} != {SCHEMA_VERSION}")
+        return cls(
+            d["skills"], d["job_desc_clean"], d["jd_hits"], d["vocabulary"],
+            np.asarray(d["jd_counts"], dtype=np.float64), d["job_desc_hash"],
+        )
+
+    def save(self, path=DEFAULT_PROFILE_PATH):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f"{path.suffix}.{os.getpid()}.tmp")
+        with open(tmp, "wb") as fh:
+            pickle.dump(self.to_dict(), fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path=DEFAULT_PROFILE_PATH):
+        with open(path, "rb") as fh:
+            return cls.from_dict(pickle.load(fh))
+
+
+def load_or_build(path=DEFAULT_PROFILE_PATH, job_desc=JOB_DESC, skills=SKILLS):
+    """Load the stored profile for ``job_desc``/``skills``, rebuilding and saving it if it is missing or stale."""
+    try:
+        profile = JobProfile.load(path)
+        if profile.matches(job_desc, skills):
+            return profile
+    except Exception:  # missing, stale, truncated or from an incompatible release: rebuild
+        pass
+    profile = JobProfile.build(job_desc, skills)
+    try:
+        profile.save(path)
+    except OSError:
+        pass  # read-only deployments still work, they just rebuild on every start
+    return profile
+
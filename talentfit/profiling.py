@@ -0,0 +1,119 @@
+"""cProfile capture of one analysis run.
+
+    python -m talentfit.profiling cv.pdf [-o results/] [--top 25] [--max-pages 60]
+
+runs the app's path for one CV (read the PDF, extract, score, build the DataFrame, chart and
+CSV, serialise the chart as ``st.plotly_chart`` does) under cProfile and writes, next to the
+``<name>.csv`` results, ``<name>.prof`` (open with ``python -m pstats`` or snakeviz) and
+``<name>.profile.txt`` with the top functions by cumulative time. The app's "Profile this run"
+toggle and ``python -m talentfit --profile`` use the same ``profiling()`` context.
+"""
+import argparse
+import cProfile
+import io
+import marshal
+import pstats
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+
+DEFAULT_TOP = 25
+
+
+class RunProfile:
+    """Stats of a finished profiling() block."""
+
+    def __init__(self, profiler):
+        self.profiler = profiler
+        self._stats = None
+
+    @property
+    def stats(self):
+        if self._stats is None:
+            self._stats = pstats.Stats(self.profiler)
+        return self._stats
+
+    def top(self, n=DEFAULT_TOP, sort="cumulative"):
+        """``[{"function", "file", "line", "calls", "total_s", "cumulative_s"}, ...]`` for the top ``n``."""
+        key = {"cumulative": 3, "tottime": 2}[sort]
+        rows = sorted(self.stats.stats.items(), key=lambda item: -item[1][key])[:n]
+        return [
+            {"function": func, "file": file, "line": line, "calls": nc,
+             "total_s": round(tt, 6), "cumulative_s": round(ct, 6)}
+            for (file, line, func), (cc, nc, tt, ct, _) in rows
+        ]
+
+    def text(self, n=DEFAULT_TOP, sort="cumulative"):
+        out = io.StringIO()
+        pstats.Stats(self.profiler, stream=out).sort_stats(sort).print_stats(n)
+        return out.getvalue()
+
+    def dump(self):
+        """The ``.prof`` file contents (what pstats.Stats.dump_stats writes)."""
+        return marshal.dumps(self.stats.stats)
+
+    def save(self, prefix, n=DEFAULT_TOP):
+        """Write ``<prefix>.prof`` and ``<prefix>.profile.txt``; returns both paths."""
+        prof, txt = Path(f"{prefix}.prof"), Path(f"{prefix}.profile.txt")
+        prof.write_bytes(self.dump())
+        txt.write_text(self.text(n))
+        return prof, txt
+
+
+@contextmanager
+def profiling():
+    """Profile the block; the yielded RunProfile is readable once the block has exited."""
+    profiler = cProfile.Profile()
+    run = RunProfile(profiler)
+    profiler.enable()
+    try:
+        yield run
+    finally:
+        profiler.disable()
+
+
+# -----------------------------
+# One CV, end to end
+# -----------------------------
+def analyze_pdf(data, scorer, max_pages=None):
+    """The app's path for one CV given as PDF bytes; returns ``(results, df_sorted, csv)``."""
+    from .report import build_report
+    from .scoring import read_pdf_limited
+
+    text = read_pdf_limited(io.BytesIO(data), max_pages)
+    results = scorer.score(text)
+    _, df_sorted, fig, csv, _, _ = build_report(results)
+    fig.to_json()  # what st.plotly_chart sends to the browser
+    return results, df_sorted, csv
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profile the analysis of one CV PDF.")
+    parser.add_argument("pdf")
+    parser.add_argument("-o", "--output-dir", default=".", help="where the results and profile go")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP, help="functions listed by cumulative time")
+    parser.add_argument("--max-pages", type=int, default=None)
+    parser.add_argument("--cold", action="store_true",
+                        help="profile the first run, including the lazy imports of PyPDF2, pandas and plotly")
+    args = parser.parse_args(argv)
+
+    from .profile import load_or_build
+    from .vectors import JobScorer
+
+    scorer = JobScorer(profile=load_or_build())
+    data = Path(args.pdf).read_bytes()
+    if not args.cold:
+        analyze_pdf(data, scorer, args.max_pages)  # a running app has already loaded everything
+    prefix = Path(args.output_dir) / Path(args.pdf).stem
+    prefix.parent.mkdir(parents=True, exist_ok=True)
+    with profiling() as run:
+        _, _, csv = analyze_pdf(data, scorer, args.max_pages)
+    Path(f"{prefix}.csv").write_text(csv)
+    prof, txt = run.save(prefix, args.top)
+    for row in run.top(args.top):
+        print(f"{row['cumulative_s']:>10.4f}s {row['calls']:>8}  {row['function']} ({Path(row['file']).name}:{row['line']})")
+    print(f"-> {prefix}.csv, {prof}, {txt}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
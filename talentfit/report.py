@@ -0,0 +1,34 @@
+from contextlib import nullcontext
+
+from . import timing
+from .scoring import STRONG_MATCH
+
+
+def build_report(results, trace=False):
+    """DataFrame, ranked DataFrame, bar chart and CSV for one CV's ``[[skill, score], ...]``.
+
+    Returns ``(df, df_sorted, fig, csv, stage timings, trace events)``; the trace events are
+    empty unless ``trace``.
+    """
+    import pandas as pd  # heavy; imported on the first report, not at app start-up
+    import plotly.express as px
+
+    tracer = timing.Tracer("report") if trace else None
+    with timing.recording() as timings, timing.tracing(tracer) if trace else nullcontext():
+        with timing.stage("dataframe"):
+            df = pd.DataFrame(results, columns=["Skill", "Match %"])
+            df_sorted = df.sort_values("Match %", ascending=False)
+        with timing.stage("plotly"):
+            fig = px.bar(
+                df_sorted,
+                x="Skill",
+                y="Match %",
+                title="Skill Match Overview",
+                range_y=[0, 100],
+                color=df_sorted["Match %"].apply(lambda x: "Strong" if x >= STRONG_MATCH else "Needs Work"),
+                color_discrete_map={"Strong": "#00CC66", "Needs Work": "#FF9933"}
+            )
+        with timing.stage("csv") as span:
+            csv = df_sorted.to_csv(index=False)
+            span.chars = len(csv)
+    return df, df_sorted, fig, csv, timings.as_dict(), tracer.events if trace else []
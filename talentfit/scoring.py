@@ -0,0 +1,96 @@
+import re
+
+from . import timing
+from .backends import resolve
+from .data import JOB_DESC, SKILLS
+
+# Score given to a skill when either the CV or the job description has no keyword hits
+FALLBACK_SCORE = 40
+STRONG_MATCH = 70
+
+
+# -----------------------------
+# Helper functions
+# -----------------------------
+def read_pdf(file, backend=None):
+    """Text of every page; ``backend`` names a talentfit.backends extractor (PyPDF2 by default) or is "auto"."""
+    with timing.span("read_pdf"):
+        return "".join(page_text + " " for page_text in _raw_pages(file, backend=backend))
+
+def _raw_pages(file, max_pages=None, backend=None):
+    backend, file = resolve(backend, file)
+    with timing.stage("pdf_open", args={"backend": backend.name}):
+        document = backend.open(file)
+    for number, page in enumerate(backend.pages(document, max_pages), 1):
+        with timing.stage("read_pdf_page", args={"page": number}) as span:
+            page_text = backend.page_text(page)
+            span.chars = len(page_text or "")
+        if page_text:
+            yield page_text
+
+def iter_pdf_pages(file, max_pages=None, max_chars=None, backend=None):
+    """Lazily yield the cleaned text of each non-empty page.
+
+    Stops after ``max_pages`` pages or once ``max_chars`` characters have been yielded (the
+    last page is cut at the budget). Joining the pages with " " gives clean_text(read_pdf(file))
+    when no budget is hit.
+    """
+    chars = 0
+    for page_text in _raw_pages(file, max_pages, backend):
+        page_text = clean_text(page_text)
+        if not page_text:
+            continue
+        if max_chars is not None and chars + len(page_text) >= max_chars:
+            if max_chars > chars:
+                yield page_text[:max_chars - chars]
+            return
+        chars += len(page_text) + 1
+        yield page_text
+
+def read_pdf_limited(file, max_pages=None, max_chars=None, backend=None):
+    with timing.span("read_pdf", {"max_pages": max_pages, "max_chars": max_chars}):
+        return " ".join(iter_pdf_pages(file, max_pages, max_chars, backend))
+
+def clean_text(t):
+    if not t:
+        return ""
+    with timing.stage("clean_text", chars=len(t)):
+        t = re.sub(r"\s+", " ", t)
+        t = t.replace("\u00A0", " ").strip()
+    return t
+
+def calculate_similarity(text1, text2):
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.metrics.pairwise import cosine_similarity
+
+    with timing.stage("similarity"):
+        vectorizer = TfidfVectorizer(stop_words="english")
+        tfidf = vectorizer.fit_transform([text1, text2])
+        score = cosine_similarity(tfidf[0:1], tfidf[1:2])[0][0]
+    return round(score * 100, 2)
+
+
+# -----------------------------
+# Scoring
+# -----------------------------
+def score_skills(cv_text, job_desc_clean, skills=SKILLS):
+    """Return ``[[skill, score], ...]`` in taxonomy order for an already cleaned CV text."""
+    results = []
+    for skill, keywords in skills.items():
+        with timing.span("skill", {"skill": skill}):
+            with timing.stage("keyword_matching", chars=len(cv_text), args={"skill": skill}):
+                cv_part = " ".join([k for k in keywords if k.lower() in cv_text.lower()])
+                jd_part = " ".join([k for k in keywords if k.lower() in job_desc_clean.lower()])
+            score = calculate_similarity(cv_part, jd_part) if cv_part and jd_part else FALLBACK_SCORE
+        results.append([skill, score])
+    return results
+
+def overall_score(results):
+    return round(sum(score for _, score in results) / len(results), 2) if results else 0.0
+
+def score_text(raw_cv_text, job_desc=JOB_DESC, skills=SKILLS):
+    cv_text = clean_text(raw_cv_text)
+    return score_skills(cv_text, clean_text(job_desc), skills)
+
+def score_pdf(file, job_desc=JOB_DESC, skills=SKILLS):
+    return score_text(read_pdf(file), job_desc, skills)
@@ -0,0 +1,269 @@
+"""Local HTTP scoring service (ASGI).
+
+    python -m talentfit.service --port 8000 [--workers N]
+
+Endpoints:
+
+* ``GET  /health``      -> ``{"status": "ok", "workers": N, ...}``
+* ``GET  /metrics``     -> Prometheus text format (see talentfit.metrics)
+* ``POST /score/text``  JSON ``{"text": "...", "id": "optional"}``
+* ``POST /score/pdf``   raw PDF bytes as the body (``Content-Type: application/pdf``),
+  optional ``?name=cv.pdf``
+
+Both scoring endpoints answer ``{"id", "overall", "skills": {skill: score}, "error"}``.
+Concurrent ``/score/text`` requests are coalesced into micro-batches (up to ``--batch-size``
+texts, waiting at most ``--batch-wait-ms`` for the batch to fill) and scored with one sparse
+matrix product per batch; ``--batch-size 1`` turns this off.
+Scoring runs on killable worker processes (talentfit.isolation) that load the compiled job
+profile when the server starts, so the first request does not pay for it; a request whose CV
+runs past ``--timeout`` gets an error response and its worker is replaced. Serve ``talentfit.service:app`` with any ASGI
+server; the CLI uses uvicorn.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from urllib.parse import parse_qs
+
+from . import batch, isolation, metrics
+from .cache import DEFAULT_CACHE_PATH
+from .coalesce import MicroBatcher
+from .isolation import (DEFAULT_MAX_RSS_MB, DEFAULT_MAX_TASKS, DEFAULT_MEMORY_LIMIT_MB, DEFAULT_TIMEOUT,
+                        DocumentTimeout, IsolatedPool, WorkerCrashed, WorkerStartFailed)
+from .profile import load_or_build
+
+MAX_BODY_BYTES = 20 * 1024 * 1024
+DEFAULT_BATCH_SIZE = 32
+DEFAULT_BATCH_WAIT_MS = 2.0
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _warm_up():
+    return os.getpid()
+
+def row_to_response(row, skill_names):
+    return {
+        "id": row["File"],
+        "overall": row["Overall Match %"],
+        "skills": {skill: row[skill] for skill in skill_names if skill in row},
+        "error": row["Error"],
+    }
+
+
+class ScoringService:
+    """ASGI application scoring CVs on a pre-warmed process pool."""
+
+    def __init__(self, workers=None, profile=None, cache_path=None, budget=(None, None),
+                 max_body=MAX_BODY_BYTES, batch_size=DEFAULT_BATCH_SIZE,
+                 batch_wait_ms=DEFAULT_BATCH_WAIT_MS, timeout=DEFAULT_TIMEOUT,
+                 memory_limit_mb=DEFAULT_MEMORY_LIMIT_MB, max_tasks=DEFAULT_MAX_TASKS, max_rss_mb=DEFAULT_MAX_RSS_MB):
+        self.workers = workers or os.cpu_count() or 1
+        self.profile = profile
+        self.cache_path = cache_path
+        self.budget = budget
+        self.max_body = max_body
+        self.limits = (timeout, memory_limit_mb, max_tasks, max_rss_mb)
+        self.pool = None
+        self.batcher = None
+        if batch_size > 1:
+            self.batcher = MicroBatcher(self._score_text_batch, batch_size, batch_wait_ms)
+        self._start_lock = asyncio.Lock()
+
+    # -----------------------------
+    # Lifecycle
+    # -----------------------------
+    async def startup(self):
+        self.profile = self.profile or load_or_build()
+        self.pool = IsolatedPool(self.workers, batch._init_worker, (self.profile, self.cache_path, self.budget),
+                                 *self.limits)
+        # Start every worker (and run its initializer) before accepting traffic
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.pool, _warm_up) for _ in range(self.workers * 2)))
+
+    async def shutdown(self):
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
+
+    async def run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.pool, fn, *args)
+
+    async def run_document(self, name, fn, *args):
+        """``run`` for a call returning one results row; a worker that times out, crashes or cannot
+        start yields an error row."""
+        try:
+            return await self.run(fn, *args)
+        except (DocumentTimeout, WorkerCrashed, WorkerStartFailed) as exc:
+            return batch._failed_row(name, exc)
+
+    async def _score_text_batch(self, items):
+        texts, names = zip(*items)
+        try:
+            rows = await self.run(batch._score_texts, list(texts), list(names))
+        except (DocumentTimeout, WorkerCrashed, WorkerStartFailed) as exc:
+            rows = [batch._failed_row(name, exc) for name in names]
+        for row in rows:
+            metrics.observe_document(row, source="text", batch_size=len(rows))
+        return rows
+
+    # -----------------------------
+    # Endpoints
+    # -----------------------------
+    async def score_text(self, body, query):
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError:
+            raise HTTPError(400, "body must be JSON")
+        text = payload.get("text") if isinstance(payload, dict) else None
+        if not isinstance(text, str):
+            raise HTTPError(400, 'expected {"text": "..."}')
+        name = str(payload.get("id", ""))
+        if self.batcher is not None:
+            row = await self.batcher.submit((text, name))
+        else:
+            row = await self.run_document(name, batch._score_text, text, name)
+            metrics.observe_document(row, source="text")
+        return 200, row_to_response(row, self.profile.skills)
+
+    async def score_pdf(self, body, query):
+        if not body:
+            raise HTTPError(400, "empty body; send the PDF bytes")
+        name = query.get("name", ["upload.pdf"])[0]
+        row = await self.run_document(name, batch._score_path, body, name)
+        metrics.observe_document(row)
+        return (422 if row["Error"] else 200), row_to_response(row, self.profile.skills)
+
+    async def health(self, body, query):
+        payload = {"status": "ok" if self.pool is not None else "starting", "workers": self.workers}
+        if self.pool is not None:
+            payload["isolation"] = self.pool.stats()  # workers started / recycled, timeouts, crashes
+        if self.batcher is not None:
+            payload["batching"] = self.batcher.stats()
+        return 200, payload
+
+    async def prometheus(self, body, query):
+        return 200, metrics.REGISTRY.expose()
+
+    # -----------------------------
+    # ASGI plumbing
+    # -----------------------------
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif scope["type"] == "http":
+            await self._http(scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                try:
+                    await self.startup()
+                except Exception as exc:
+                    await send({"type": "lifespan.startup.failed", "message": str(exc)})
+                    return
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.shutdown()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _read_body(self, receive):
+        chunks, size = [], 0
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                raise HTTPError(499, "client disconnected")
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > self.max_body:
+                raise HTTPError(413, f"body larger than {self.max_body} bytes")
+            chunks.append(chunk)
+            if not message.get("more_body"):
+                return b"".join(chunks)
+
+    async def _http(self, scope, receive, send):
+        routes = {
+            ("GET", "/health"): self.health,
+            ("GET", "/metrics"): self.prometheus,
+            ("POST", "/score/text"): self.score_text,
+            ("POST", "/score/pdf"): self.score_pdf,
+        }
+        handler = routes.get((scope["method"], scope["path"]))
+        start = time.perf_counter()
+        try:
+            if handler is None:
+                raise HTTPError(404, "not found")
+            if self.pool is None:
+                async with self._start_lock:  # server without lifespan support
+                    if self.pool is None:
+                        await self.startup()
+            body = await self._read_body(receive)
+            status, payload = await handler(body, parse_qs(scope.get("query_string", b"").decode()))
+        except HTTPError as exc:
+            status, payload = exc.status, {"error": str(exc)}
+        if status == 499:
+            return
+        if scope["path"].startswith("/score/") and status in (200, 422):
+            # Only requests that were scored; fast rejections (400/404/413) would drag the latency down
+            metrics.END_TO_END_SECONDS.observe(time.perf_counter() - start)
+        if isinstance(payload, str):
+            data, content_type = payload.encode(), metrics.CONTENT_TYPE.encode()
+        else:
+            data, content_type = json.dumps(payload).encode(), b"application/json"
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", content_type), (b"content-length", str(len(data)).encode())],
+        })
+        await send({"type": "http.response.body", "body": data})
+
+
+# For ``uvicorn talentfit.service:app``; the CLI builds its own instance from its flags
+app = ScoringService(cache_path=DEFAULT_CACHE_PATH)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the CV scoring API on localhost.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("-j", "--workers", type=int, default=None, help="scoring processes (default: all cores)")
+    parser.add_argument("--cache", default=str(DEFAULT_CACHE_PATH), help="SQLite cache of extracted text")
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--max-pages", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help="most /score/text requests scored together (1 disables batching)")
+    parser.add_argument("--batch-wait-ms", type=float, default=DEFAULT_BATCH_WAIT_MS,
+                        help="longest a request waits for its batch to fill")
+    isolation.add_arguments(parser)
+    args = parser.parse_args(argv)
+    try:
+        import uvicorn
+    except ImportError:
+        print("The scoring service needs an ASGI server: pip install uvicorn", file=sys.stderr)
+        return 1
+    timeout, memory_limit_mb, max_tasks, max_rss_mb = isolation.limits(args)
+    service = ScoringService(
+        workers=args.workers,
+        cache_path=None if args.no_cache else args.cache,
+        budget=(args.max_pages, None),
+        batch_size=args.batch_size,
+        batch_wait_ms=args.batch_wait_ms,
+        timeout=timeout,
+        memory_limit_mb=memory_limit_mb,
+        max_tasks=max_tasks,
+        max_rss_mb=max_rss_mb,
+    )
+    uvicorn.run(service, host=args.host, port=args.port, log_level="warning")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
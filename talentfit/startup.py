@@ -0,0 +1,124 @@
+"""Cold-start accounting for the Streamlit app.
+
+Inside the app, ``mark`` records milestones (ms since this module was first imported, i.e. the
+first script run of the server process) and ``lazy_import`` times the first import of each
+heavy module. ``report`` summarises both against the cold-start budget.
+
+Offline, ``python -m talentfit.startup`` runs the app's start-up imports in a fresh interpreter
+under ``-X importtime``, prints the most expensive ones and exits non-zero when they exceed
+the budget or pull in a module that must stay lazy.
+"""
+import argparse
+import importlib
+import os
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# Must not be imported before the uploader is on screen (streamlit itself loads the light
+# ``plotly`` base package; plotly.express is what pulls in pandas)
+HEAVY_MODULES = ("pandas", "plotly.express", "sklearn", "scipy", "numpy", "PyPDF2")
+# What app.py imports before its first render
+STARTUP_IMPORTS = ("streamlit", "talentfit.startup", "talentfit.cache")
+DEFAULT_BUDGET_MS = float(os.environ.get("TALENTFIT_COLD_START_BUDGET_MS", 1500))
+
+_origin = time.perf_counter()
+_marks = {}
+_imports = {}
+_heavy_at_first_render = None
+
+
+def _elapsed_ms(since=None):
+    return round((time.perf_counter() - (_origin if since is None else since)) * 1000, 2)
+
+def mark(name):
+    """Record the first time ``name`` is reached; later calls (reruns) are ignored."""
+    global _heavy_at_first_render
+    if name not in _marks:
+        _marks[name] = _elapsed_ms()
+        if name == "first_render":
+            _heavy_at_first_render = loaded_heavy_modules()
+
+def lazy_import(name):
+    """importlib.import_module that remembers how long the first import took."""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    _imports[name] = _elapsed_ms(start)
+    return module
+
+def loaded_heavy_modules():
+    return sorted(m for m in HEAVY_MODULES if m in sys.modules)
+
+def report(budget_ms=DEFAULT_BUDGET_MS):
+    first_render = _marks.get("first_render")
+    return {
+        "marks_ms": dict(_marks),
+        "lazy_imports_ms": dict(_imports),
+        "heavy_at_first_render": _heavy_at_first_render,
+        "budget_ms": budget_ms,
+        "over_budget": first_render is not None and first_render > budget_ms,
+    }
+
+def report_markdown(budget_ms=DEFAULT_BUDGET_MS):
+    r = report(budget_ms)
+    lines = ["| Step | ms |", "|---|---:|"]
+    lines += [f"| {name} | {ms} |" for name, ms in r["marks_ms"].items()]
+    lines += [f"| import {name} | {ms} |" for name, ms in r["lazy_imports_ms"].items()]
+    return "\n".join(lines)
+
+
+# -----------------------------
+# Offline check: python -X importtime
+# -----------------------------
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+def measure_imports(modules=STARTUP_IMPORTS, python=sys.executable):
+    """Import ``modules`` in a fresh interpreter; return ``(wall_ms, [(module, self_us, cumulative_us, depth)])``."""
+    code = "; ".join(f"import {m}" for m in modules)
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(Path(__file__).resolve().parent.parent),
+                                                                     os.environ.get("PYTHONPATH")])))
+    start = time.perf_counter()
+    proc = subprocess.run([python, "-X", "importtime", "-c", code], capture_output=True, text=True, env=env)
+    wall_ms = _elapsed_ms(start)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "import failed")
+    rows = []
+    for line in proc.stderr.splitlines():
+        m = _IMPORTTIME_LINE.match(line)
+        if m:
+            rows.append((m.group(4), int(m.group(1)), int(m.group(2)), (len(m.group(3)) - 1) // 2))
+    return wall_ms, rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check the app's cold-start import budget.")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--top", type=int, default=15, help="show the N most expensive top-level imports")
+    parser.add_argument("modules", nargs="*", default=list(STARTUP_IMPORTS))
+    args = parser.parse_args(argv)
+
+    wall_ms, rows = measure_imports(args.modules)
+    imported_ms = sum(cum for _, _, cum, depth in rows if depth == 0) / 1000
+    heavy = sorted({name for name, *_ in rows} & set(HEAVY_MODULES))
+
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for name, self_us, cum_us, _ in sorted((r for r in rows if r[3] == 0), key=lambda r: -r[2])[:args.top]:
+        print(f"{cum_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {name}")
+    print(f"\nimports: {imported_ms:.1f} ms, interpreter wall: {wall_ms:.1f} ms, budget: {args.budget_ms:.0f} ms")
+
+    failed = False
+    if heavy:
+        print(f"FAIL: heavy modules imported at start-up: {', '.join(heavy)}")
+        failed = True
+    if imported_ms > args.budget_ms:
+        print("FAIL: start-up imports exceed the cold-start budget")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
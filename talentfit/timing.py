@@ -0,0 +1,280 @@
+"""Per-stage wall time and byte/char counters for the scoring pipeline.
+
+Pipeline code wraps each stage in ``timing.stage(name)``; nothing is recorded (and the cost
+is one context-variable lookup) unless the caller has activated a recorder::
+
+    with timing.recording() as timings:
+        score_pdf("cv.pdf")
+    timings.as_dict()  # {"read_pdf_page": {"calls": 2, "ms": 41.3, "max_ms": 30.2, "chars": 7621, ...}, ...}
+
+Stages are flat aggregates (calls, total and slowest call, bytes, chars). For the nested
+picture of a single run, ``tracing()`` additionally records every stage, plus the trace-only
+``span``s around them, as Chrome Trace Event JSON (open it in chrome://tracing or Perfetto)::
+
+    with timing.tracing() as tracer:
+        score_pdf("cv.pdf")
+    tracer.save("cv.trace.json")
+
+``StageTimings(memory=True)`` also records each stage's peak Python heap growth (tracemalloc,
+which must be tracing; it slows the run down, so this is opt-in), and ``peak_memory()`` does
+the same for any block, e.g. a whole document.
+"""
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Display order; stages not listed here are shown after these
+STAGES = ("upload_read", "text_cache", "cache_hit", "cache_miss", "pdf_probe", "pdf_open", "read_pdf_page", "clean_text", "keyword_matching",
+          "similarity", "dataframe", "plotly", "plotly_render", "csv")
+
+_current = ContextVar("talentfit_timings", default=None)
+_tracer = ContextVar("talentfit_tracer", default=None)
+
+
+class Span:
+    """Counters a stage may fill in while it runs (``span.chars = len(text)``)."""
+
+    __slots__ = ("bytes", "chars")
+
+    def __init__(self, bytes=0, chars=0):
+        self.bytes = bytes
+        self.chars = chars
+
+
+# -----------------------------
+# Peak memory (tracemalloc)
+# -----------------------------
+_memory = threading.local()
+
+def _memory_enter():
+    """Start measuring a (possibly nested) block; tracemalloc's single peak counter is shared by
+    all open blocks, so each block carries the peak its inner blocks reset away."""
+    stack = _memory.__dict__.setdefault("stack", [])
+    current, peak = tracemalloc.get_traced_memory()
+    if stack:
+        stack[-1][1] = max(stack[-1][1], peak)
+    tracemalloc.reset_peak()
+    stack.append([current, 0])
+
+def _memory_exit():
+    """Peak bytes above the block's starting heap size."""
+    stack = _memory.stack
+    start, carried = stack.pop()
+    peak = max(tracemalloc.get_traced_memory()[1], carried)
+    if stack:
+        stack[-1][1] = max(stack[-1][1], peak)
+    return max(0, peak - start)
+
+
+class PeakMemory:
+    """``with peak_memory() as m: ...`` then ``m.peak_bytes``; 0 when tracemalloc is not tracing."""
+
+    def __init__(self):
+        self.peak_bytes = 0
+        self._active = False
+
+    def __enter__(self):
+        self._active = tracemalloc.is_tracing()
+        if self._active:
+            _memory_enter()
+        return self
+
+    def __exit__(self, *exc):
+        if self._active:
+            self.peak_bytes = _memory_exit()
+        return False
+
+peak_memory = PeakMemory
+
+def rss_bytes():
+    """Current resident set size of this process (Linux), else its peak RSS."""
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class _Stage:
+    __slots__ = ("timings", "tracer", "name", "span", "args", "start", "memory")
+
+    def __init__(self, timings, tracer, name, span, args=None):
+        self.timings = timings
+        self.tracer = tracer
+        self.name = name
+        self.span = span
+        self.args = args
+        self.memory = timings is not None and timings.memory and tracemalloc.is_tracing()
+
+    def __enter__(self):
+        if self.memory:
+            _memory_enter()
+        self.start = time.perf_counter()
+        return self.span
+
+    def __exit__(self, *exc):
+        end = time.perf_counter()
+        if self.timings is not None:
+            peak = _memory_exit() if self.memory else None
+            self.timings.add(self.name, end - self.start, self.span.bytes, self.span.chars, peak_bytes=peak)
+        if self.tracer is not None:
+            args = dict(self.args or ())
+            if self.span.bytes:
+                args["bytes"] = self.span.bytes
+            if self.span.chars:
+                args["chars"] = self.span.chars
+            self.tracer.add(self.name, self.start, end, args)
+        return False
+
+
+class _NullStage:
+    def __enter__(self):
+        return Span()
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class StageTimings:
+    """Accumulated ``{stage: {calls, seconds, max_seconds, bytes, chars[, peak_bytes]}}`` of one or more runs."""
+
+    def __init__(self, stages=None, memory=False):
+        self.stages = {}
+        self.memory = memory
+        if stages:
+            self.merge(stages)
+
+    def stage(self, name, bytes=0, chars=0):
+        return _Stage(self, None, name, Span(bytes, chars))
+
+    def add(self, name, seconds, bytes=0, chars=0, calls=1, max_seconds=None, peak_bytes=None):
+        entry = self.stages.get(name)
+        if entry is None:
+            entry = self.stages[name] = {"calls": 0, "seconds": 0.0, "max_seconds": 0.0, "bytes": 0, "chars": 0}
+        entry["calls"] += calls
+        entry["seconds"] += seconds
+        entry["max_seconds"] = max(entry["max_seconds"], seconds if max_seconds is None else max_seconds)
+        entry["bytes"] += bytes
+        entry["chars"] += chars
+        if peak_bytes is not None:  # the largest single call, like max_seconds
+            entry["peak_bytes"] = max(entry.get("peak_bytes", 0), peak_bytes)
+
+    def merge(self, other):
+        """Add another StageTimings, or the ``as_dict()`` of one (e.g. sent back by a worker)."""
+        if isinstance(other, StageTimings):
+            other = other.as_dict()
+        for name, entry in other.items():
+            self.add(name, entry["ms"] / 1000, entry["bytes"], entry["chars"], entry["calls"], entry["max_ms"] / 1000,
+                     entry.get("peak_bytes"))
+        return self
+
+    def total_seconds(self):
+        return sum(entry["seconds"] for entry in self.stages.values())
+
+    def as_dict(self):
+        """Plain, picklable ``{stage: {"calls", "ms", "max_ms", "bytes", "chars"[, "peak_bytes"]}}`` in display order."""
+        order = {name: i for i, name in enumerate(STAGES)}
+        stages = {}
+        for name, e in sorted(self.stages.items(), key=lambda item: order.get(item[0], len(order))):
+            stages[name] = {"calls": e["calls"], "ms": round(e["seconds"] * 1000, 3),
+                            "max_ms": round(e["max_seconds"] * 1000, 3), "bytes": e["bytes"], "chars": e["chars"]}
+            if "peak_bytes" in e:
+                stages[name]["peak_bytes"] = e["peak_bytes"]
+        return stages
+
+    def to_markdown(self):
+        stages = self.as_dict()
+        memory = any("peak_bytes" in e for e in stages.values())
+        lines = ["| Stage | Calls | ms | Slowest ms | Bytes | Chars |" + (" Peak MB |" if memory else ""),
+                 "|---|---:|---:|---:|---:|---:|" + ("---:|" if memory else "")]
+        for name, e in stages.items():
+            line = f"| {name} | {e['calls']} | {e['ms']:.1f} | {e['max_ms']:.1f} | {e['bytes']:,} | {e['chars']:,} |"
+            if memory:
+                line += f" {e['peak_bytes'] / 1e6:.2f} |" if "peak_bytes" in e else " |"
+            lines.append(line)
+        lines.append(f"| **total** | | {self.total_seconds() * 1000:.1f} | | | |" + (" |" if memory else ""))
+        return "\n".join(lines)
+
+
+class Tracer:
+    """Collects complete ("X") Chrome Trace Events; timestamps are wall-clock microseconds, so
+    events recorded in different processes (worker and app) line up when merged."""
+
+    def __init__(self, process_name="talentfit"):
+        self.pid = os.getpid()
+        self.events = [{"name": "process_name", "ph": "M", "pid": self.pid, "tid": 0,
+                        "args": {"name": f"{process_name} ({self.pid})"}}]
+        self._offset = time.time() - time.perf_counter()
+
+    def add(self, name, start, end, args=None):
+        event = {"name": name, "ph": "X", "ts": round((self._offset + start) * 1e6, 1),
+                 "dur": round((end - start) * 1e6, 1), "pid": self.pid, "tid": threading.get_native_id()}
+        if args:
+            event["args"] = args
+        self.events.append(event)
+
+    def extend(self, events):
+        self.events.extend(events)
+        return self
+
+    def to_json(self):
+        return {"traceEvents": self.events, "displayTimeUnit": "ms"}
+
+    def save(self, path):
+        with open(path, "w") as fh:
+            json.dump(self.to_json(), fh)
+        return path
+
+
+@contextmanager
+def recording(timings=None):
+    """Record every ``stage`` entered in this context (thread / task) into ``timings``."""
+    timings = StageTimings() if timings is None else timings
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+
+def current():
+    return _current.get()
+
+@contextmanager
+def tracing(tracer=None):
+    """Also record every ``stage`` and ``span`` entered in this context as a trace event."""
+    tracer = Tracer() if tracer is None else tracer
+    token = _tracer.set(tracer)
+    try:
+        yield tracer
+    finally:
+        _tracer.reset(token)
+
+def stage(name, bytes=0, chars=0, args=None):
+    """Context manager timing ``name`` into the active recorder and tracer; a no-op when neither is active.
+
+    ``args`` (e.g. the page number) only go into the trace.
+    """
+    timings, tracer = _current.get(), _tracer.get()
+    if timings is None and tracer is None:
+        return _NULL_STAGE
+    return _Stage(timings, tracer, name, Span(bytes, chars), args)
+
+def span(name, args=None):
+    """A trace-only stage: groups nested stages in the trace without adding to the timings."""
+    tracer = _tracer.get()
+    return _NULL_STAGE if tracer is None else _Stage(None, tracer, name, Span(), args)
+
+def count(name, n=1):
+    """Count an event (no time) under ``name`` in the active recorder, e.g. a cache hit."""
+    timings = _current.get()
+    if timings is not None:
+        timings.add(name, 0.0, calls=n)
@@ -0,0 +1,138 @@
+import math
+
+import numpy as np
+from scipy import sparse
+
+from . import timing
+from .data import JOB_DESC, SKILLS
+from .matcher import KeywordMatcher
+from .profile import JobProfile, keyword_vectorizer
+from .scoring import FALLBACK_SCORE
+
+# calculate_similarity fits a smoothed TF-IDF on exactly two documents, so a term's idf is
+# ln(3 / (1 + df)) + 1: 1.0 when both sides contain it and this value when only one does.
+ONE_SIDED_IDF = math.log(1.5) + 1.0
+
+
+class JobScorer:
+    """Per-skill scorer for the whole taxonomy, compiled once into sparse matrices.
+
+    Produces the same scores as ``score_skills``. With P distinct keywords, S skills and V
+    keyword terms:
+
+    * ``skill_indicator`` (P x S) counts how often each keyword is listed under each skill;
+      ``hits @ skill_indicator > 0`` says which skills have a non-empty CV keyword part.
+    * ``term_counts`` (P x S*V) holds each keyword's term counts in its skill's block, so
+      ``hits @ term_counts`` is the term-count vector of every skill's CV keyword part.
+
+    Only terms present on both sides enter the cosine's dot product, with idf 1; all other terms
+    only enter the norms, with ONE_SIDED_IDF. The sums that needs are taken per (CV, skill) cell
+    over the non-zeros of ``hits @ term_counts``, so a batch of CVs is scored without any
+    per-skill Python loop.
+    """
+
+    def __init__(self, job_desc=JOB_DESC, skills=SKILLS, profile=None):
+        # A precompiled profile (see talentfit.profile) takes precedence over job_desc/skills
+        self.profile = profile or JobProfile.build(job_desc, skills)
+        self.skills = self.profile.skills
+        self.skill_names = list(self.skills)
+        self.matcher = KeywordMatcher.from_skills(self.skills)
+        self._skill_keywords = [[(k, self.matcher.id_of(k)) for k in kws if k] for kws in self.skills.values()]
+        self.job_desc_clean = self.profile.job_desc_clean
+        self.jd_parts = self.profile.jd_parts
+        self.vectorizer = keyword_vectorizer(self.profile.vocabulary)
+        self.jd_counts = self.profile.jd_counts
+        self._jd_has_hits = np.array([bool(p) for p in self.jd_parts])
+        self._compile()
+
+    def _compile(self):
+        n_keywords, n_skills = len(self.matcher.patterns), len(self.skill_names)
+        n_terms = len(self.profile.vocabulary)
+        width = n_skills * n_terms
+
+        indicator = sparse.dok_matrix((n_keywords, n_skills), dtype=np.float64)
+        counts = sparse.dok_matrix((n_keywords, width), dtype=np.float64)
+        for s, keywords in enumerate(self._skill_keywords):
+            if not keywords:
+                continue
+            keyword_terms = self.vectorizer.transform([k for k, _ in keywords]).tocoo()
+            for _, pid in keywords:
+                indicator[pid, s] += 1
+            for row, term, value in zip(keyword_terms.row, keyword_terms.col, keyword_terms.data):
+                counts[keywords[row][1], s * n_terms + term] += value
+        self.skill_indicator = indicator.tocsr()
+        self.term_counts = counts.tocsr()
+
+        self._n_terms = n_terms
+        self._jd_flat = self.jd_counts.ravel()
+        self._jd_sq_sum = (self.jd_counts ** 2).sum(axis=1)
+
+    # -----------------------------
+    # Keyword hits
+    # -----------------------------
+    def cv_parts(self, cv_text):
+        """Join each skill's keywords found in ``cv_text``, in taxonomy order."""
+        return self.parts_from_hits(self.matcher.hit_ids(cv_text))
+
+    def parts_from_hits(self, hit_ids):
+        return [" ".join(k for k, i in kws if i in hit_ids) for kws in self._skill_keywords]
+
+    def hit_matrix(self, hit_id_sets):
+        """Binary (CVs x keywords) matrix from one set of keyword ids per CV."""
+        rows = [r for r, ids in enumerate(hit_id_sets) for _ in ids]
+        cols = [i for ids in hit_id_sets for i in ids]
+        return sparse.csr_matrix(
+            (np.ones(len(cols)), (rows, cols)), shape=(len(hit_id_sets), len(self.matcher.patterns))
+        )
+
+    # -----------------------------
+    # Scoring
+    # -----------------------------
+    def cosine_matrix(self, hits):
+        """(CVs x skills) two-document TF-IDF cosines for a (CVs x keywords) hit matrix."""
+        n_cvs, n_skills = hits.shape[0], len(self.skill_names)
+        cv_counts = (hits @ self.term_counts).tocsr()
+        cv_counts.sum_duplicates()
+
+        # Aggregate the non-zero entries per (CV, skill) cell
+        rows = np.repeat(np.arange(n_cvs), np.diff(cv_counts.indptr))
+        cells = rows * n_skills + cv_counts.indices // self._n_terms
+        c = cv_counts.data
+        j = self._jd_flat[cv_counts.indices]
+        shared = j > 0
+        c_sq = c * c
+
+        def per_cell(weights):
+            sums = np.bincount(cells, weights, minlength=n_cvs * n_skills)
+            return sums.astype(np.float64, copy=False).reshape(n_cvs, n_skills)
+
+        one_sided = ONE_SIDED_IDF ** 2
+        dot = per_cell(c * j)
+        cv_norm2 = one_sided * per_cell(c_sq) - (one_sided - 1.0) * per_cell(np.where(shared, c_sq, 0.0))
+        jd_norm2 = one_sided * self._jd_sq_sum - (one_sided - 1.0) * per_cell(np.where(shared, j * j, 0.0))
+        denom = np.sqrt(cv_norm2 * jd_norm2)
+        return np.divide(dot, denom, out=np.zeros_like(dot), where=denom > 0)
+
+    def score_hit_sets(self, hit_id_sets):
+        with timing.stage("similarity"):
+            hits = self.hit_matrix(hit_id_sets)
+            cosine = self.cosine_matrix(hits)
+            scored = ((hits @ self.skill_indicator).toarray() > 0) & self._jd_has_hits
+        return [
+            [[skill, round(float(c) * 100, 2) if ok else FALLBACK_SCORE]
+             for skill, c, ok in zip(self.skill_names, cos_row, ok_row)]
+            for cos_row, ok_row in zip(cosine, scored)
+        ]
+
+    def score_many(self, cv_texts):
+        """Score a batch of cleaned CV texts with one set of sparse products."""
+        with timing.span("JobScorer.score_many", {"cvs": len(cv_texts)}):
+            return self.score_hit_sets([self.matcher.hit_ids(t) for t in cv_texts])
+
+    def score_pages(self, pages):
+        """Score cleaned page texts (e.g. from iter_pdf_pages) as they are produced."""
+        return self.score_hit_sets([self.matcher.hit_ids_stream(pages)])[0]
+
+    def score(self, cv_text):
+        """Score an already cleaned CV text; returns ``[[skill, score], ...]`` like score_skills."""
+        return self.score_many([cv_text])[0]